@@ -11,7 +11,27 @@ DATABASE_URL = os.getenv(
     "postgresql+psycopg2://atlas:atlas@db:5432/atlas",
 )
 
-engine = create_engine(DATABASE_URL)
+# Up to 30 connections per worker instead of QueuePool's default 5 + 10, so
+# bursts of form posts reuse warm connections instead of waiting for one.
+# Pre-ping drops connections the server closed while idle, and recycling keeps
+# them under typical proxy/PgBouncer idle timeouts. SQLite (local dev and the
+# tests) keeps SQLAlchemy's defaults.
+_POOL_SIZE = 20
+_MAX_OVERFLOW = 10
+# Most connections one worker can hold at once; app.main sizes the route
+# threadpool from it so threads never queue on pool_timeout for a connection.
+POOL_CAPACITY = _POOL_SIZE + _MAX_OVERFLOW
+_POOL_OPTIONS = {
+    "pool_size": _POOL_SIZE,
+    "max_overflow": _MAX_OVERFLOW,
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+engine = create_engine(
+    DATABASE_URL, **({} if DATABASE_URL.startswith("sqlite") else _POOL_OPTIONS)
+)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
@@ -1,18 +1,30 @@
+from __future__ import annotations
+
+import asyncio
 import json
 import logging
 import os
+import threading
 import time
-from datetime import datetime
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import orjson
 from pydantic import ValidationError
 
-from . import models, schemas
+from . import llm_batch, llm_cache, models, schemas
+
+if TYPE_CHECKING:
+    # openai, httpx and requests together add several hundred ms to import
+    # time, so they are imported on first use rather than with this module.
+    import httpx
+    import requests
+    from openai import AsyncOpenAI, OpenAI
 
 # Model names used by the drafting and summariser helpers.
 # These default values are the documented models but can be overridden
@@ -21,6 +33,7 @@ from . import models, schemas
 # pinned `openai` client version the code was developed with.
 _DRAFTING_MODEL = os.getenv("ATLAS_DRAFTING_MODEL", "gpt-5-mini-2025-08-07")
 _SUMMARISER_MODEL = os.getenv("ATLAS_SUMMARISER_MODEL", "gpt-5-nano-2025-08-07")
+_EMBEDDING_MODEL = os.getenv("ATLAS_EMBEDDING_MODEL", "text-embedding-3-small")
 
 ADAM_GLOBAL_STYLE = """
 You are ATLAS, a drafting assistant for Adam Phillips, an AI consultant.
@@ -32,9 +45,48 @@ Use short paragraphs and bullet points. Avoid hype, jargon, and grand claims. Ne
 _DEFAULT_SYSTEM_MESSAGE = ADAM_GLOBAL_STYLE
 
 CONTEXT_DIR = Path(__file__).parent / "context"
+
+# Connection pool shared by every OpenAI call in this process so back-to-back
+# drafting/summarising requests reuse warm TLS connections.
+_OPENAI_POOL_LIMITS = {"max_connections": 32, "max_keepalive_connections": 16}
+# Seconds. Connects should be near-instant; reasoning-model replies can take a
+# while, so only the connect phase is kept short.
+_OPENAI_TIMEOUT = {"timeout": 120.0, "connect": 3.0}
+# The SDK retries connection errors, 408/409/429 and 5xx itself with jittered
+# exponential backoff (honouring Retry-After), so callers never wrap calls in
+# their own retry loops.
+_OPENAI_MAX_RETRIES = 2
+_WEBSITE_POOL_LIMITS = {"max_connections": 20, "max_keepalive_connections": 10}
+_WEBSITE_HEADERS = {"User-Agent": "AtlasBD/1.0"}
+# (connect, read) seconds: fail fast on dead hosts, stay patient with slow pages.
+_WEBSITE_TIMEOUT = (3.05, 10)
+# Parser cost is linear in input size, but only the first ~1200 tokens of text
+# reach the prompt, so anything past this many bytes of HTML is wasted work.
+_MAX_HOMEPAGE_BYTES = 200_000
+_HOMEPAGE_CHUNK_BYTES = 16_384
+_NON_CONTENT_TAGS = ["script", "style", "noscript"]
+# Regenerating a draft or retrying an ingest re-reads the same homepage, so each
+# worker keeps recent URL -> cleaned excerpt results for an hour. Failed fetches
+# are never cached.
+_HOMEPAGE_TEXT_CACHE = llm_cache.MemoryCache(maxsize=256, ttl=3600)
+# The custom email page summarises the contact's homepage on every GET and POST.
+# Summaries are kept for a day, keyed by the full prompt (URL, company and
+# excerpt), so a changed URL or homepage copy gets a fresh summary. Unlike the
+# opt-in response cache this is always on: the summary is reference material,
+# not a draft the user expects to vary between clicks.
+_WEBSITE_SUMMARY_CACHE = llm_cache.MemoryCache(maxsize=512, ttl=86400)
+_RESPONSE_CACHE_STATS = llm_cache.CacheStats()
+# Rough English average used when tiktoken is unavailable.
+_CHARS_PER_TOKEN = 4
+# Upper bound on model/website calls a single batch helper keeps in flight.
+_MAX_CONCURRENT_CALLS = 8
+# Streamed deltas are coalesced to at least this many characters per chunk so
+# the HTTP layer is not flushing one token at a time.
+_STREAM_FLUSH_CHARS = 32
 logger = logging.getLogger("atlas.intel")
 
 
+@lru_cache(maxsize=None)
 def _load_example(filename: str) -> str:
     """Best-effort load for style-reference markdown files."""
     try:
@@ -48,6 +100,34 @@ FOLLOWUP_EMAIL_EXAMPLE = _load_example("followup_workshop_emerson.md")
 SPITFIRE_FOLLOWUP_EXAMPLE = _load_example("followup_spitfire.md")
 
 
+def _reference_section(heading: str, example: str) -> str:
+    if not example:
+        return ""
+    return f"\n{heading}\n\"\"\"{example}\"\"\"\n"
+
+
+# The style references never change at runtime, so their prompt blocks are
+# assembled once here rather than on every draft call.
+_FIRST_EMAIL_REFERENCE_BLOCK = _reference_section(
+    "Reference example for tone and cadence (do not copy wording or mention Emerson/Marcin):",
+    INTRO_EMAIL_EXAMPLE,
+)
+_FOLLOWUP_REFERENCE_BLOCK = _reference_section(
+    "Reference example for tone, structure, and scannability (do not copy wording or mention Emerson/Marcin):",
+    FOLLOWUP_EMAIL_EXAMPLE,
+) + _reference_section(
+    "Reference example for consultant-to-consultant follow-up with 2–3 AI options (do not copy wording or mention Spitfire/Marc/Christian):",
+    SPITFIRE_FOLLOWUP_EXAMPLE,
+)
+_CUSTOM_REFERENCE_BLOCK = _reference_section(
+    "Reference example (workshop-style, long-form follow-up) – use only for cadence and sectioning:",
+    FOLLOWUP_EMAIL_EXAMPLE,
+) + _reference_section(
+    "Reference example (Spitfire AI opportunities) – use only for consultant-to-consultant tone, numbered options, and closing:",
+    SPITFIRE_FOLLOWUP_EXAMPLE,
+)
+
+
 CONTACT_SOURCE_DESCRIPTIONS = {
     "referral": "Referred by a mutual contact or client (specific name may be unclear).",
     "cold_linkedin": "Identified via LinkedIn outreach; Adam initiated the conversation directly.",
@@ -65,16 +145,74 @@ _CRM_FACT_TEMPLATE: Dict[str, Any] = {
     "next_action_hint": None,
     "summary": "",
 }
-_VALID_INTENTS = {
-    "interested_in_ai_audit",
-    "wants_training",
-    "outreach_workflow",
-    "lss_green_belt_with_ai",
-    "followup_needed",
-    "general_interest",
-    "unclear",
+_CRM_FACT_SCHEMA = """{
+  "contact_name": string|null,
+  "contact_email": string|null,
+  "org": string|null,
+  "intent": one of ["interested_in_ai_audit","wants_training","outreach_workflow","lss_green_belt_with_ai","followup_needed","general_interest","unclear"],
+  "mentioned_process": short string such as "outreach", "internal_audit", "proposal_workflow", "lss_green_belt", or "other/unclear",
+  "timeline": one of ["this_month","next_quarter","later","unknown"],
+  "next_action_hint": short free-text suggestion or null,
+  "summary": 2-4 sentence recap for Adam.
+}"""
+# Sources per CRM_FACT_EXTRACTOR call in `extract_crm_facts_bulk`; keeps each
+# multi-document prompt comfortably inside the summariser's context window.
+_CRM_FACT_BATCH_SIZE = 10
+_INTENT_DEFAULT = "unclear"
+_TIMELINE_DEFAULT = "unknown"
+_VALID_INTENTS: FrozenSet[str] = frozenset(
+    {
+        "interested_in_ai_audit",
+        "wants_training",
+        "outreach_workflow",
+        "lss_green_belt_with_ai",
+        "followup_needed",
+        "general_interest",
+        _INTENT_DEFAULT,
+    }
+)
+_VALID_TIMELINES: FrozenSet[str] = frozenset({"this_month", "next_quarter", "later", _TIMELINE_DEFAULT})
+
+
+def _strict_json_schema(model: Any, *, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Adapt a pydantic model's JSON schema to OpenAI strict structured output.
+
+    Strict mode wants every property required, no extra keys, and none of the
+    annotation keywords (defaults, titles, length limits) it does not support.
+    """
+    schema = model.model_json_schema()
+    properties = {
+        name: _strip_schema_keywords(prop)
+        for name, prop in schema["properties"].items()
+        if name not in set(exclude)
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _strip_schema_keywords(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {
+            key: _strip_schema_keywords(value)
+            for key, value in node.items()
+            if key not in ("default", "title", "maxLength")
+        }
+    if isinstance(node, list):
+        return [_strip_schema_keywords(item) for item in node]
+    return node
+
+
+# raw_text is filled in by Atlas, never by the model.
+_CRM_FACT_RESPONSE_SCHEMA = {
+    "name": "crm_fact",
+    "schema": _strict_json_schema(schemas.CRMFactPayload, exclude=("raw_text",)),
 }
-_VALID_TIMELINES = {"this_month", "next_quarter", "later", "unknown"}
+
+
 def _flag_enabled(name: str, default: bool = True) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -89,40 +227,310 @@ def fact_extraction_enabled() -> bool:
 def suggestions_feature_enabled() -> bool:
     return _flag_enabled("INTEL_SUGGESTIONS_ENABLED", True) and bool(os.getenv("OPENAI_API_KEY"))
 
-def _shorten_snippet(value: Optional[str], *, limit: int = 180, placeholder: str = "(unclear)") -> str:
+
+def shorten_snippet(value: Optional[str], *, limit: int = 180, placeholder: str = "(unclear)") -> str:
+    """Collapse whitespace and cut to `limit` characters; shared with the custom email previews."""
     if not value:
         return placeholder
-    compact = " ".join(value.split())
+    # Collapsing a bounded window is enough whenever it already overflows the
+    # limit (its compact form is a prefix of the full one); only short or
+    # whitespace-heavy windows need the whole value.
+    window = value[: limit * 2]
+    compact = " ".join(window.split())
+    if len(compact) <= limit and len(window) < len(value):
+        compact = " ".join(value.split())
     if len(compact) <= limit:
         return compact
     return compact[: limit - 3].rstrip() + "..."
 
 
+def _iso_date(value: Optional[date], placeholder: str = "(undated)") -> str:
+    """Format a date or datetime as YYYY-MM-DD; isoformat is cheaper than strftime."""
+    if not value:
+        return placeholder
+    return value.isoformat()[:10]
+
+
+# Homepages with less visible text than this (splash pages, cookie walls, JS-only
+# shells) cannot ground any of the analyser's sections, so no model is called.
+_THIN_HOMEPAGE_CHARS = 200
+# Short excerpts go to the cheaper summariser model; there is little to reason over.
+_SHORT_HOMEPAGE_CHARS = 800
+_THIN_HOMEPAGE_SUMMARY = """
+What they do
+- (unclear) The homepage exposes too little text to summarise.
+
+Likely priorities / pressures
+- (unclear)
+
+Credible AI pilots for Adam to explore
+No grounded pilots identified - homepage too generic. The site returned almost no readable text, so nothing can be grounded in it.
+""".strip()
+
+
+def _website_model_for(excerpt: str) -> Optional[str]:
+    """Pick the BD_WEBSITE_ANALYSER model for `excerpt`; None means skip the call."""
+    if len(excerpt) < _THIN_HOMEPAGE_CHARS:
+        return None
+    if len(excerpt) < _SHORT_HOMEPAGE_CHARS:
+        return _SUMMARISER_MODEL
+    return _DRAFTING_MODEL
+
+
 def fetch_and_summarise_website(url: str, company_name: str) -> str:
     """Fetch a homepage and derive structured BD notes."""
+    excerpt = _fetch_clean_homepage(url)
+    target_model = _website_model_for(excerpt)
+    if target_model is None:
+        return _THIN_HOMEPAGE_SUMMARY
+    prompt = _build_website_prompt(url, company_name, excerpt)
+    summary_key = llm_cache.make_key(target_model, ADAM_GLOBAL_STYLE, prompt)
+    summary = _WEBSITE_SUMMARY_CACHE.get(summary_key)
+    if summary is None:
+        summary = _invoke_model(
+            prompt,
+            model=target_model,
+            system_message=ADAM_GLOBAL_STYLE,
+            semantic_key=(f"website:{url}", excerpt),
+        )
+        if summary:
+            _WEBSITE_SUMMARY_CACHE.set(summary_key, summary)
+    return summary
+
+
+async def afetch_and_summarise_website(url: str, company_name: str) -> str:
+    """Async twin of `fetch_and_summarise_website` using the shared httpx pool."""
+    excerpt = await _afetch_clean_homepage(url)
+    target_model = _website_model_for(excerpt)
+    if target_model is None:
+        return _THIN_HOMEPAGE_SUMMARY
+    prompt = _build_website_prompt(url, company_name, excerpt)
+    summary_key = llm_cache.make_key(target_model, ADAM_GLOBAL_STYLE, prompt)
+    summary = _WEBSITE_SUMMARY_CACHE.get(summary_key)
+    if summary is None:
+        summary = await _ainvoke_model(
+            prompt,
+            model=target_model,
+            system_message=ADAM_GLOBAL_STYLE,
+            semantic_key=(f"website:{url}", excerpt),
+        )
+        if summary:
+            _WEBSITE_SUMMARY_CACHE.set(summary_key, summary)
+    return summary
+
+
+# The fetch helpers return only the short excerpt, so the raw HTML response and
+# the parsed tree are released before the (slow) model call rather than held
+# for its whole duration.
+def _fetch_clean_homepage(url: str) -> str:
+    """Return the cleaned excerpt for `url`, reusing this worker's recent fetches."""
+    excerpt = _HOMEPAGE_TEXT_CACHE.get(url)
+    if excerpt is not None:
+        return excerpt
+    import requests
+
+    record = _load_homepage_record(url)
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        response = _get_http_session().get(
+            url, timeout=_WEBSITE_TIMEOUT, stream=True, headers=_conditional_headers(record)
+        )
+        try:
+            if record is not None and response.status_code == 304:
+                excerpt = record["excerpt"]
+            else:
+                response.raise_for_status()
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=_HOMEPAGE_CHUNK_BYTES):
+                    body += chunk
+                    if len(body) >= _MAX_HOMEPAGE_BYTES:
+                        break
+        finally:
+            response.close()
     except requests.RequestException as exc:  # pragma: no cover - network guardrail
         raise RuntimeError("Website content could not be fetched reliably.") from exc
+    if excerpt is None:
+        html = bytes(body[:_MAX_HOMEPAGE_BYTES]).decode(response.encoding or "utf-8", errors="replace")
+        excerpt = _extract_homepage_text(html)
+    _save_homepage_record(url, excerpt, response.headers)
+    _HOMEPAGE_TEXT_CACHE.set(url, excerpt)
+    return excerpt
+
+
+async def _afetch_clean_homepage(url: str) -> str:
+    import httpx
+
+    excerpt = _HOMEPAGE_TEXT_CACHE.get(url)
+    if excerpt is not None:
+        return excerpt
+    record = _load_homepage_record(url)
+    try:
+        async with _get_async_http().stream(
+            "GET", url, headers=_conditional_headers(record)
+        ) as response:
+            if record is not None and response.status_code == 304:
+                excerpt = record["excerpt"]
+            else:
+                response.raise_for_status()
+                body = bytearray()
+                async for chunk in response.aiter_bytes(_HOMEPAGE_CHUNK_BYTES):
+                    body += chunk
+                    if len(body) >= _MAX_HOMEPAGE_BYTES:
+                        break
+    except httpx.HTTPError as exc:  # pragma: no cover - network guardrail
+        raise RuntimeError("Website content could not be fetched reliably.") from exc
+    if excerpt is None:
+        html = bytes(body[:_MAX_HOMEPAGE_BYTES]).decode(response.encoding or "utf-8", errors="replace")
+        excerpt = _extract_homepage_text(html)
+    _save_homepage_record(url, excerpt, response.headers)
+    _HOMEPAGE_TEXT_CACHE.set(url, excerpt)
+    return excerpt
+
+
+# With ATLAS_LLM_CACHE on, each homepage's excerpt is kept on disk with its
+# ETag / Last-Modified validators. Later runs revalidate with a conditional GET;
+# a 304 reuses the stored excerpt, which reproduces the earlier prompt exactly,
+# so the summary comes straight from the response cache without an OpenAI call.
+@lru_cache(maxsize=1)
+def _get_homepage_record_cache() -> llm_cache.FileCache:
+    return llm_cache.FileCache(llm_cache.default_cache_dir() / "homepages")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
 
-    text_content = soup.get_text(separator=" ")
+def _load_homepage_record(url: str) -> Optional[Dict[str, str]]:
+    if not _flag_enabled("ATLAS_LLM_CACHE", False):
+        return None
+    raw = _get_homepage_record_cache().get(llm_cache.make_key("homepage", "", url))
+    if raw is None:
+        return None
+    try:
+        record = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("excerpt"), str):
+        return None
+    return record
+
+
+def _conditional_headers(record: Optional[Dict[str, str]]) -> Dict[str, str]:
+    if record is None:
+        return {}
+    headers = {}
+    if record.get("etag"):
+        headers["If-None-Match"] = record["etag"]
+    if record.get("last_modified"):
+        headers["If-Modified-Since"] = record["last_modified"]
+    return headers
+
+
+def _save_homepage_record(url: str, excerpt: str, response_headers: Any) -> None:
+    if not _flag_enabled("ATLAS_LLM_CACHE", False):
+        return
+    etag = response_headers.get("ETag")
+    last_modified = response_headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return
+    record = {"excerpt": excerpt, "etag": etag, "last_modified": last_modified}
+    _get_homepage_record_cache().set(
+        llm_cache.make_key("homepage", "", url),
+        orjson.dumps(record).decode("utf-8"),
+        ttl=llm_cache.default_ttl(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_http_session() -> requests.Session:
+    """Return the shared keep-alive session used for homepage fetches."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(_WEBSITE_HEADERS)
+    # urllib3 only lists codecs it can decode (br appears once brotli is installed).
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING.replace(",", ", ")
+    return session
+
+
+def _get_async_http() -> httpx.AsyncClient:
+    return _loop_client("website", _build_async_http)
+
+
+def _build_async_http() -> httpx.AsyncClient:
+    import httpx
+
+    connect_timeout, read_timeout = _WEBSITE_TIMEOUT
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        follow_redirects=True,
+        limits=httpx.Limits(**_WEBSITE_POOL_LIMITS),
+        headers=_WEBSITE_HEADERS,
+    )
+
+
+def _extract_homepage_text(html: str) -> str:
+    """Strip markup from a homepage and return the excerpt the analyser sees."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    # One C-level pass instead of a CSS query plus a Python loop of decompose() calls.
+    tree.strip_tags(_NON_CONTENT_TAGS)
+
+    root = tree.body or tree.root
+    text_content = root.text(separator=" ", strip=True) if root is not None else ""
     cleaned = " ".join(text_content.split())
-    truncated = cleaned[:5000]
+    return _truncate_to_token_budget(cleaned, _website_token_budget())
 
-    # BD_WEBSITE_ANALYSER turns homepage excerpts into BD intel and grounded pilot ideas.
-    prompt = f"""
-You are BD_WEBSITE_ANALYSER. Work only with the homepage excerpt provided.
 
-Company name: {company_name}
-Website URL: {url}
+def _website_token_budget() -> int:
+    try:
+        return max(1, int(os.getenv("ATLAS_WEBSITE_TOKEN_BUDGET", "1200")))
+    except ValueError:
+        return 1200
 
-Homepage excerpt:
-\"\"\"{truncated}\"\"\"
+
+@lru_cache(maxsize=1)
+def _get_token_encoder() -> Any:
+    """Return the tiktoken encoder, or None when it cannot be loaded.
+
+    tiktoken downloads its BPE table on first use, so an offline worker falls
+    back to the character estimate in `_truncate_to_token_budget`.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        logger.warning("token_encoder_unavailable")
+        return None
+
+
+def _truncate_to_token_budget(text: str, budget: int) -> str:
+    # Never tokenise more than a generous multiple of the budget; homepages can be huge.
+    text = text[: budget * _CHARS_PER_TOKEN * 4]
+    encoder = _get_token_encoder()
+    if encoder is None:
+        return text[: budget * _CHARS_PER_TOKEN]
+    tokens = encoder.encode(text)
+    if len(tokens) <= budget:
+        return text
+    return encoder.decode(tokens[:budget])
+
+
+# Every prompt is a fixed prefix (role, reference block, rules) followed by the
+# per-contact block. Keeping every static token ahead of the variable ones lets
+# OpenAI's automatic prompt caching reuse the prefix across contacts; only the
+# suffix is formatted per call.
+_PROMPT_DIVIDER = "\n\n---\n\n"
+# BD_WEBSITE_ANALYSER turns homepage excerpts into BD intel and grounded pilot ideas.
+_WEBSITE_ANALYSER_PREFIX = """
+You are BD_WEBSITE_ANALYSER. Work only with the homepage excerpt provided after the divider below.
 
 Output these sections in order:
 What they do
@@ -143,9 +551,19 @@ Rules:
 - Prefer concrete, operational wording over slogans.
 """.strip()
 
-    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
 
+def _build_website_prompt(url: str, company_name: str, excerpt: str) -> str:
+    company_block = f"""
+Company name: {company_name}
+Website URL: {url}
 
+Homepage excerpt:
+\"\"\"{excerpt}\"\"\"
+""".strip()
+    return "".join((_WEBSITE_ANALYSER_PREFIX, _PROMPT_DIVIDER, company_block))
+
+
+@lru_cache(maxsize=4096)
 def _infer_first_name(full_name: str) -> Optional[str]:
     if not full_name:
         return None
@@ -155,15 +573,24 @@ def _infer_first_name(full_name: str) -> Optional[str]:
     return parts[0]
 
 
-def _build_greeting(contact: models.Contact) -> str:
-    first_name = _infer_first_name(contact.name)
+def build_greeting(contact: models.Contact) -> str:
+    """Greeting shared by the custom email form and every email writer prompt."""
+    return _greeting_for_name(contact.name)
+
+
+# Keyed on the name string (not the ORM row) so repeat drafts for the same
+# contact skip the split and formatting entirely.
+@lru_cache(maxsize=4096)
+def _greeting_for_name(name: Optional[str]) -> str:
+    first_name = _infer_first_name(name) if name else None
     if first_name:
         return f"Hi {first_name},"
-    if contact.name:
-        return f"Hi {contact.name},"
+    if name:
+        return f"Hi {name},"
     return "Hi there,"
 
 
+@lru_cache(maxsize=32)
 def _describe_contact_source(source: Optional[str]) -> str:
     """Return a short phrase describing how Adam found the contact."""
     if not source:
@@ -176,35 +603,100 @@ def _describe_contact_source(source: Optional[str]) -> str:
 
 def draft_first_email(contact: models.Contact, website_summary: Optional[str]) -> str:
     """Draft the first outreach email in Adam's voice."""
-    greeting = _build_greeting(contact)
-    source_context = _describe_contact_source(getattr(contact, 'source', None))
-    if website_summary:
-        cleaned_summary = website_summary.strip()
-        website_section = f"Website summary from BD_WEBSITE_ANALYSER:\n{cleaned_summary}"
-    else:
-        website_section = "Website summary unavailable; acknowledge the gap instead of guessing."
+    prompt = _build_first_email_prompt(contact, website_summary)
+    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
 
-    reference_block = ""
-    if INTRO_EMAIL_EXAMPLE:
-        reference_block = (
-            "\nReference example for tone and cadence (do not copy wording or mention Emerson/Marcin):\n"
-            f"\"\"\"{INTRO_EMAIL_EXAMPLE}\"\"\"\n"
-        )
 
-    # BD_FIRST_EMAIL_WRITER drafts first-touch outreach grounded in contact context and Adam's philosophy.
-    prompt = f"""
-You are BD_FIRST_EMAIL_WRITER. Draft Adam Phillips' first outreach email in his tone and philosophy.
-{reference_block}
+def draft_first_email_stream(
+    contact: models.Contact, website_summary: Optional[str]
+) -> Iterator[str]:
+    """Stream the first outreach email as the model writes it."""
+    prompt = _build_first_email_prompt(contact, website_summary)
+    return _invoke_model_stream(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+async def adraft_first_email(contact: models.Contact, website_summary: Optional[str]) -> str:
+    """Async twin of `draft_first_email`."""
+    prompt = _build_first_email_prompt(contact, website_summary)
+    return await _ainvoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+async def adraft_first_emails(contacts: Sequence[models.Contact]) -> List[str]:
+    """Fetch websites and draft intros for several contacts concurrently.
+
+    Each contact's homepage fetch and draft still run in order, but the
+    contacts overlap, so a batch costs roughly one fetch + one draft of
+    wall-clock time (bounded by `_MAX_CONCURRENT_CALLS`).
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CALLS)
+
+    async def _draft(contact: models.Contact) -> str:
+        async with semaphore:
+            website_summary: Optional[str] = None
+            if contact.website_url:
+                try:
+                    website_summary = await afetch_and_summarise_website(
+                        contact.website_url, contact.company_name
+                    )
+                except Exception:
+                    website_summary = None
+            return await adraft_first_email(contact, website_summary)
+
+    return list(await asyncio.gather(*(_draft(contact) for contact in contacts)))
 
-Contact snapshot:
-- Name: {contact.name}
-- Role: {contact.role}
-- Company: {contact.company_name}
-- How Adam found them: {source_context}
-- Immediate goal: Book a 20-30 minute intro conversation next week.
-- Website insight: {website_section}
-Greeting to use verbatim: {greeting}
 
+async def adraft_bundle(
+    contact: models.Contact, note: Optional[models.Note] = None
+) -> Tuple[Optional[str], Optional[str], str]:
+    """Return `(website_summary, note_summary, first_email)` for one contact.
+
+    The homepage summary and the note summary do not depend on each other, so
+    both requests run together; only the email waits for the website summary.
+    A failed homepage fetch drafts without a summary, as the single-contact
+    route does.
+    """
+
+    async def _website() -> Optional[str]:
+        if not contact.website_url:
+            return None
+        try:
+            return await afetch_and_summarise_website(contact.website_url, contact.company_name)
+        except Exception:
+            return None
+
+    async def _note() -> Optional[str]:
+        if note is None:
+            return None
+        return await asummarise_note(note, contact)
+
+    website_summary, note_summary = await asyncio.gather(_website(), _note())
+    first_email = await adraft_first_email(contact, website_summary)
+    return website_summary, note_summary, first_email
+
+
+def draft_first_emails(
+    contacts: Sequence[models.Contact], website_summaries: Optional[Sequence[Optional[str]]] = None
+) -> List[str]:
+    """Draft first emails for several contacts from already-known website summaries.
+
+    Prompts are built up front and sent concurrently through
+    `_invoke_model_many`; use `adraft_first_emails` when homepages still
+    need fetching.
+    """
+    summaries = list(website_summaries) if website_summaries is not None else [None] * len(contacts)
+    calls = [
+        (_build_first_email_prompt(contact, summary), _DRAFTING_MODEL, ADAM_GLOBAL_STYLE)
+        for contact, summary in zip(contacts, summaries)
+    ]
+    return _invoke_model_many(calls)
+
+
+# BD_FIRST_EMAIL_WRITER drafts first-touch outreach grounded in contact context and Adam's philosophy.
+_FIRST_EMAIL_HEAD = (
+    "You are BD_FIRST_EMAIL_WRITER. Draft Adam Phillips' first outreach email in his tone and philosophy.\n"
+    + _FIRST_EMAIL_REFERENCE_BLOCK
+)
+_FIRST_EMAIL_RULES = """
 Output requirements:
 - Subject line: <= 7 words, plain English.
 - Body: 3-6 short paragraphs (no bullets unless they improve clarity).
@@ -222,8 +714,66 @@ Rules:
 - Reinforce that Adam designs AI systems that assist people, keep humans in the loop, and measure value.
 - Drafts are starting points for Adam to edit; never imply the email is auto-sent.
 """.strip()
+_FIRST_EMAIL_PREFIX = f"{_FIRST_EMAIL_HEAD}\n{_FIRST_EMAIL_RULES}"
+
+
+def _build_first_email_prompt(contact: models.Contact, website_summary: Optional[str]) -> str:
+    greeting = build_greeting(contact)
+    source_context = _describe_contact_source(getattr(contact, 'source', None))
+    if website_summary:
+        cleaned_summary = website_summary.strip()
+        website_section = f"Website summary from BD_WEBSITE_ANALYSER:\n{cleaned_summary}"
+    else:
+        website_section = "Website summary unavailable; acknowledge the gap instead of guessing."
+
+    contact_block = f"""
+Contact snapshot:
+- Name: {contact.name}
+- Role: {contact.role}
+- Company: {contact.company_name}
+- How Adam found them: {source_context}
+- Immediate goal: Book a 20-30 minute intro conversation next week.
+- Website insight: {website_section}
+Greeting to use verbatim: {greeting}
+""".strip()
+    prompt = "".join((_FIRST_EMAIL_PREFIX, _PROMPT_DIVIDER, contact_block))
+    return prompt
+
+
+# BD_FOLLOWUP_WRITER assembles detailed follow-ups grounded in logged interactions and notes.
+_FOLLOWUP_EMAIL_HEAD = (
+    "You are BD_FOLLOWUP_WRITER. Build a detailed but readable follow-up email for Adam Phillips.\n"
+    + _FOLLOWUP_REFERENCE_BLOCK
+)
+_FOLLOWUP_EMAIL_RULES = """
+Output requirements:
+- Subject line: <= 9 words.
+- Body must include these sections, in order:
+  1. Thank you + context (1 short paragraph) that thanks them for the conversation and restates the meeting purpose in plain English.
+  2. What I heard (1 paragraph + optional 3-5 bullets) summarising their situation and priorities.
+  3. Opportunities / options (2-4 bullets) describing concrete pieces of work or workshop segments (e.g. "Examples -> your context", "Assist, not replace", "Interactive mapping", "Champions & quick wins"). Each bullet should explain purpose and value.
+  4. Guardrails & measures (short paragraph) reiterating human-in-the-loop, read-only access, auditability, and 2-4 potential measures (hours back, fewer rework loops, better first-pass approval, traceability completeness).
+  5. Next steps (1 paragraph) spelling out the proposed next step (e.g. 90-min session, capped workshop, 1-2 page brief) and asking for a 20-30 minute call or scheduled slot next week.
+
+Rules:
+- < 350 words.
+- Mark any uncertain detail with (needs confirmation) instead of guessing.
+- No new pricing, scope, or timeline promises beyond the inputs.
+- Keep tone pragmatic and plain English; drafts are for Adam to edit.
+""".strip()
+_FOLLOWUP_EMAIL_PREFIX = f"{_FOLLOWUP_EMAIL_HEAD}\n{_FOLLOWUP_EMAIL_RULES}"
+
+
+def _describe_touch(interaction: models.Interaction) -> str:
+    ts = interaction.timestamp
+    if isinstance(ts, date):
+        ts_display = _iso_date(ts)
+    elif ts:
+        ts_display = str(ts)
+    else:
+        ts_display = "Unknown date"
+    return f"{ts_display}: {interaction.type.replace('_', ' ')} - {interaction.summary}"
 
-    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
 
 def draft_followup_email(
     contact: models.Contact,
@@ -231,38 +781,44 @@ def draft_followup_email(
     notes: Sequence[models.Note],
 ) -> str:
     """Draft a follow-up email after prior touchpoints."""
-    greeting = _build_greeting(contact)
-    latest_interaction = interactions[0] if interactions else None
-    if latest_interaction:
-        ts = latest_interaction.timestamp
-        if isinstance(ts, datetime):
-            ts_display = ts.strftime("%Y-%m-%d")
-        elif ts:
-            ts_display = str(ts)
-        else:
-            ts_display = "Unknown date"
-        last_touch_description = (
-            f"{ts_display}: {latest_interaction.type.replace('_', ' ')} - {latest_interaction.summary}"
-        )
-    else:
-        last_touch_description = "No recorded meetings or calls."
-    interaction_lines = []
-    for interaction in interactions[:10]:
-        ts = interaction.timestamp
-        if isinstance(ts, datetime):
-            ts_display = ts.strftime("%Y-%m-%d")
-        elif ts:
-            ts_display = str(ts)
-        else:
-            ts_display = "Unknown date"
-        interaction_lines.append(
-            f"- {ts_display}: {interaction.type.replace('_', ' ')} - {interaction.summary}"
-        )
-    interactions_section = "\n".join(interaction_lines) if interaction_lines else "(No prior interactions logged)"
+    prompt = _build_followup_email_prompt(contact, interactions, notes)
+    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+async def adraft_followup_email(
+    contact: models.Contact,
+    interactions: Sequence[models.Interaction],
+    notes: Sequence[models.Note],
+) -> str:
+    """Async twin of `draft_followup_email`."""
+    prompt = _build_followup_email_prompt(contact, interactions, notes)
+    return await _ainvoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+def draft_followup_email_stream(
+    contact: models.Contact,
+    interactions: Sequence[models.Interaction],
+    notes: Sequence[models.Note],
+) -> Iterator[str]:
+    """Stream the follow-up email as the model writes it."""
+    prompt = _build_followup_email_prompt(contact, interactions, notes)
+    return _invoke_model_stream(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+def _build_followup_email_prompt(
+    contact: models.Contact,
+    interactions: Sequence[models.Interaction],
+    notes: Sequence[models.Note],
+) -> str:
+    greeting = build_greeting(contact)
+    # One pass over the capped history; the newest line doubles as the last touch.
+    touch_lines = [_describe_touch(interaction) for interaction in islice(interactions, 10)]
+    last_touch_description = touch_lines[0] if touch_lines else "No recorded meetings or calls."
+    interactions_section = "- " + "\n- ".join(touch_lines) if touch_lines else "(No prior interactions logged)"
 
     latest_note = notes[0] if notes else None
     if latest_note and latest_note.meeting_date:
-        note_date = latest_note.meeting_date.strftime("%Y-%m-%d")
+        note_date = _iso_date(latest_note.meeting_date)
     elif latest_note:
         note_date = "Unknown date"
     else:
@@ -271,23 +827,8 @@ def draft_followup_email(
     note_raw = latest_note.raw_notes if latest_note else "(none)"
     note_summary = latest_note.processed_summary if latest_note else "(none)"
     followup_intent = "Provide a grounded recap and propose the next step."
-    reference_block = ""
-    if FOLLOWUP_EMAIL_EXAMPLE:
-        reference_block += (
-            "\nReference example for tone, structure, and scannability (do not copy wording or mention Emerson/Marcin):\n"
-            f"\"\"\"{FOLLOWUP_EMAIL_EXAMPLE}\"\"\"\n"
-        )
-    if SPITFIRE_FOLLOWUP_EXAMPLE:
-        reference_block += (
-            "\nReference example for consultant-to-consultant follow-up with 2–3 AI options (do not copy wording or mention Spitfire/Marc/Christian):\n"
-            f"\"\"\"{SPITFIRE_FOLLOWUP_EXAMPLE}\"\"\"\n"
-        )
-
-    # BD_FOLLOWUP_WRITER assembles detailed follow-ups grounded in logged interactions and notes.
-    prompt = f"""
-You are BD_FOLLOWUP_WRITER. Build a detailed but readable follow-up email for Adam Phillips.
-{reference_block}
 
+    contact_block = f"""
 Contact details:
 - Name: {contact.name}
 - Role: {contact.role}
@@ -306,24 +847,48 @@ Latest note:
 - Date: {note_date}
 - Raw excerpt: {note_raw}
 - Processed summary: {note_summary}
+""".strip()
+    return "".join((_FOLLOWUP_EMAIL_PREFIX, _PROMPT_DIVIDER, contact_block))
+
 
+# BD_CUSTOM_EMAIL_WRITER turns briefs + tone guidance into bespoke drafts that stay within Adam's guardrails.
+_CUSTOM_EMAIL_HEAD = (
+    "You are BD_CUSTOM_EMAIL_WRITER supporting Adam Phillips.\n"
+    + _CUSTOM_REFERENCE_BLOCK
+)
+_CUSTOM_EMAIL_RULES = """
 Output requirements:
-- Subject line: <= 9 words.
-- Body must include these sections, in order:
-  1. Thank you + context (1 short paragraph) that thanks them for the conversation and restates the meeting purpose in plain English.
-  2. What I heard (1 paragraph + optional 3-5 bullets) summarising their situation and priorities.
-  3. Opportunities / options (2-4 bullets) describing concrete pieces of work or workshop segments (e.g. "Examples -> your context", "Assist, not replace", "Interactive mapping", "Champions & quick wins"). Each bullet should explain purpose and value.
-  4. Guardrails & measures (short paragraph) reiterating human-in-the-loop, read-only access, auditability, and 2-4 potential measures (hours back, fewer rework loops, better first-pass approval, traceability completeness).
-  5. Next steps (1 paragraph) spelling out the proposed next step (e.g. 90-min session, capped workshop, 1-2 page brief) and asking for a 20-30 minute call or scheduled slot next week.
+- Subject line: <= 8 words aligned with the stated purpose.
+- Body: reuse the greeting, then write 2-4 lean paragraphs that preserve every concrete intent, fact, or constraint in the brief.
+
+Paragraph guidance:
+- Reorder and tighten Adam's points for clarity while keeping his voice professional, warm, concise, and problem-first.
+- Restate "forethought first, start small -> prove value -> scale what works" naturally.
+- Weave in the website insight when it exists; if it is missing, flag the gap lightly with (more detail needed).
+- End with a clear next step that matches the required ask (infer it from the brief when purpose = "other").
+- Use selected interactions and notes to ground the draft in real conversations, decisions, pains, and agreed next steps; summarise only what helps this email.
+- Pull through 1-2 concrete pains or opportunities from the selected history when relevant so the email never reads generic.
 
 Rules:
-- < 350 words.
-- Mark any uncertain detail with (needs confirmation) instead of guessing.
-- No new pricing, scope, or timeline promises beyond the inputs.
-- Keep tone pragmatic and plain English; drafts are for Adam to edit.
+- Plain English; no hype, jargon, or new offers/pricing beyond the brief.
+- Never introduce new client names or promises Adam did not mention.
+- Do not reuse client names from the examples.
+- Do not copy sentences from the examples; mirror structure only.
+- History is context, not a new source of truth: do not contradict the brief, and do not invent or overwrite logged details.
+- If no history is provided, behave as usual: rely on the brief + optional website summary.
+- If the brief lacks key details, include one short line inviting clarification (e.g., "Happy to tighten this once I know more about ___ (more detail needed)").
+- Mark uncertainties with "(needs confirmation)" or "(more detail needed)" instead of guessing.
+- Keep Adam's guardrails explicit: assistive AI, humans approve drafts, read-only data access, auditability, measurable outcomes.
 """.strip()
+_CUSTOM_EMAIL_PREFIX = f"{_CUSTOM_EMAIL_HEAD}\n{_CUSTOM_EMAIL_RULES}"
+# Purpose -> the ask the draft must end with.
+_CUSTOM_EMAIL_ASKS = {
+    "intro": "Ask for a first conversation next week.",
+    "follow_up": "Reference prior exchanges and ask for a progress call next week.",
+    "check_in": "Check in on momentum and request a brief sync next week.",
+    "other": "Follow the purpose implied by the brief.",
+}
 
-    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
 
 def draft_custom_email(
     contact: models.Contact,
@@ -338,52 +903,83 @@ def draft_custom_email(
     selected_notes: Optional[Sequence[models.Note]] = None,
 ) -> str:
     """Draft a custom email based on user-provided intent."""
-    purpose_notes = {
-        "intro": "Ask for a first conversation next week.",
-        "follow_up": "Reference prior exchanges and ask for a progress call next week.",
-        "check_in": "Check in on momentum and request a brief sync next week.",
-        "other": "Follow the purpose implied by the brief.",
-    }
-    aligned_ask = purpose_notes.get(purpose, "Follow the brief.")
+    prompt = _build_custom_email_prompt(
+        contact,
+        greeting=greeting,
+        purpose=purpose,
+        tone=tone,
+        brief=brief,
+        additional_context=additional_context,
+        website_summary=website_summary,
+        selected_interactions=selected_interactions,
+        selected_notes=selected_notes,
+    )
+    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+async def adraft_custom_email(
+    contact: models.Contact,
+    *,
+    greeting: str,
+    purpose: str,
+    tone: str,
+    brief: str,
+    additional_context: Optional[str],
+    website_summary: Optional[str],
+    selected_interactions: Optional[Sequence[models.Interaction]] = None,
+    selected_notes: Optional[Sequence[models.Note]] = None,
+) -> str:
+    """Async twin of `draft_custom_email`."""
+    prompt = _build_custom_email_prompt(
+        contact,
+        greeting=greeting,
+        purpose=purpose,
+        tone=tone,
+        brief=brief,
+        additional_context=additional_context,
+        website_summary=website_summary,
+        selected_interactions=selected_interactions,
+        selected_notes=selected_notes,
+    )
+    return await _ainvoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+
+def _build_custom_email_prompt(
+    contact: models.Contact,
+    *,
+    greeting: str,
+    purpose: str,
+    tone: str,
+    brief: str,
+    additional_context: Optional[str],
+    website_summary: Optional[str],
+    selected_interactions: Optional[Sequence[models.Interaction]],
+    selected_notes: Optional[Sequence[models.Note]],
+) -> str:
+    aligned_ask = _CUSTOM_EMAIL_ASKS.get(purpose, "Follow the brief.")
     website_insight = website_summary.strip() if website_summary else "Website summary unavailable; mention gaps rather than guessing."
     interaction_lines = []
     for interaction in selected_interactions or []:
-        timestamp = interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else "(undated)"
+        timestamp = _iso_date(interaction.timestamp)
         interaction_type = (interaction.type or "interaction").replace("_", " ")
         outcome = interaction.outcome or "(unclear)"
-        summary = _shorten_snippet(interaction.summary, limit=200)
+        summary = shorten_snippet(interaction.summary, limit=200)
         interaction_lines.append(f"- {timestamp}: {interaction_type} - outcome={outcome} - summary: {summary}")
     selected_interactions_block = "\n".join(interaction_lines)
 
     note_lines = []
     for note in selected_notes or []:
-        meeting_date = note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else "(undated)"
+        meeting_date = _iso_date(note.meeting_date)
         structured = note.processed_summary.strip() if note.processed_summary else ""
-        structured_text = _shorten_snippet(structured, limit=170, placeholder="") if structured else ""
-        raw_excerpt = _shorten_snippet(note.raw_notes, limit=150)
+        structured_text = shorten_snippet(structured, limit=170, placeholder="") if structured else ""
+        raw_excerpt = shorten_snippet(note.raw_notes, limit=150)
         if structured_text:
             note_lines.append(f"- {meeting_date}: structured: {structured_text} / raw: {raw_excerpt}")
         else:
             note_lines.append(f"- {meeting_date}: raw: {raw_excerpt}")
     selected_notes_block = "\n".join(note_lines)
 
-    reference_block = ""
-    if FOLLOWUP_EMAIL_EXAMPLE:
-        reference_block += (
-            "\nReference example (workshop-style, long-form follow-up) – use only for cadence and sectioning:\n"
-            f"\"\"\"{FOLLOWUP_EMAIL_EXAMPLE}\"\"\"\n"
-        )
-    if SPITFIRE_FOLLOWUP_EXAMPLE:
-        reference_block += (
-            "\nReference example (Spitfire AI opportunities) – use only for consultant-to-consultant tone, numbered options, and closing:\n"
-            f"\"\"\"{SPITFIRE_FOLLOWUP_EXAMPLE}\"\"\"\n"
-        )
-
-    # BD_CUSTOM_EMAIL_WRITER turns briefs + tone guidance into bespoke drafts that stay within Adam's guardrails.
-    prompt = f"""
-You are BD_CUSTOM_EMAIL_WRITER supporting Adam Phillips.
-{reference_block}
-
+    contact_block = f"""
 Contact context:
 - Name: {contact.name}
 - Role: {contact.role}
@@ -394,39 +990,15 @@ Required ask: {aligned_ask}
 Tone: {tone}
 Brief / intents: {brief}
 Additional context: {additional_context or '(none supplied)'}
-Website insight: {website_insight}
-
-Selected interaction history (may be empty):
-{selected_interactions_block or '(none selected)'}
-
-Selected notes (may be empty):
-{selected_notes_block or '(none selected)'}
-
-Output requirements:
-- Subject line: <= 8 words aligned with the stated purpose.
-- Body: reuse the greeting, then write 2-4 lean paragraphs that preserve every concrete intent, fact, or constraint in the brief.
-
-Paragraph guidance:
-- Reorder and tighten Adam's points for clarity while keeping his voice professional, warm, concise, and problem-first.
-- Restate "forethought first, start small -> prove value -> scale what works" naturally.
-- Weave in the website insight when it exists; if it is missing, flag the gap lightly with (more detail needed).
-- End with a clear next step that matches the required ask (infer it from the brief when purpose = "other").
-- Use selected interactions and notes to ground the draft in real conversations, decisions, pains, and agreed next steps; summarise only what helps this email.
-- Pull through 1-2 concrete pains or opportunities from the selected history when relevant so the email never reads generic.
+Website insight: {website_insight}
 
-Rules:
-- Plain English; no hype, jargon, or new offers/pricing beyond the brief.
-- Never introduce new client names or promises Adam did not mention.
-- Do not reuse client names from the examples.
-- Do not copy sentences from the examples; mirror structure only.
-- History is context, not a new source of truth: do not contradict the brief, and do not invent or overwrite logged details.
-- If no history is provided, behave as usual: rely on the brief + optional website summary.
-- If the brief lacks key details, include one short line inviting clarification (e.g., "Happy to tighten this once I know more about ___ (more detail needed)").
-- Mark uncertainties with "(needs confirmation)" or "(more detail needed)" instead of guessing.
-- Keep Adam's guardrails explicit: assistive AI, humans approve drafts, read-only data access, auditability, measurable outcomes.
-""".strip()
+Selected interaction history (may be empty):
+{selected_interactions_block or '(none selected)'}
 
-    return _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
+Selected notes (may be empty):
+{selected_notes_block or '(none selected)'}
+""".strip()
+    return "".join((_CUSTOM_EMAIL_PREFIX, _PROMPT_DIVIDER, contact_block))
 
 
 def extract_crm_facts_from_text(
@@ -443,7 +1015,7 @@ def extract_crm_facts_from_text(
     """Derive structured CRM facts from raw text."""
     if not fact_extraction_enabled():
         raise RuntimeError("Fact extraction is disabled.")
-    excerpt = _shorten_snippet(text, limit=600, placeholder="(unclear)")
+    excerpt = shorten_snippet(text, limit=600, placeholder="(unclear)")
     prompt = f"""
 You are CRM_FACT_EXTRACTOR. Turn the provided context into grounded CRM facts Adam can reuse later.
 
@@ -460,29 +1032,31 @@ Raw text:
 Instructions:
 - Work only with the supplied text; mark gaps with "(unclear)".
 - Output valid JSON (no comments, code fences, or prose) matching this schema:
-{{
-  "contact_name": string|null,
-  "contact_email": string|null,
-  "org": string|null,
-  "intent": one of ["interested_in_ai_audit","wants_training","outreach_workflow","lss_green_belt_with_ai","followup_needed","general_interest","unclear"],
-  "mentioned_process": short string such as "outreach", "internal_audit", "proposal_workflow", "lss_green_belt", or "other/unclear",
-  "timeline": one of ["this_month","next_quarter","later","unknown"],
-  "next_action_hint": short free-text suggestion or null,
-  "summary": 2-4 sentence recap for Adam.
-}}
+{_CRM_FACT_SCHEMA}
 - Prefer concise, factual language and reuse "(unclear)" when evidence is missing.
 - If nothing concrete is present, set intent="unclear" and leave other fields null or "(unclear)".
 """.strip()
 
     start = time.perf_counter()
     try:
-        response = _invoke_model(prompt, model=_SUMMARISER_MODEL, system_message=ADAM_GLOBAL_STYLE)
-        parsed = _best_effort_json_loads(response)
-        payload_model = _normalise_fact_payload(parsed or {}, fallback_text=text)
+        response = _invoke_model(
+            prompt,
+            model=_SUMMARISER_MODEL,
+            system_message=ADAM_GLOBAL_STYLE,
+            json_schema=_CRM_FACT_RESPONSE_SCHEMA,
+        )
+        fast_model = _validate_fact_json(response)
+        if fast_model is not None:
+            payload_model = fast_model
+            grounded = True
+        else:
+            parsed = _best_effort_json_loads(response)
+            payload_model = _normalise_fact_payload(parsed or {}, fallback_text=text)
+            grounded = parsed is not None
         success = True
     except Exception:
         success = False
-        parsed = None
+        grounded = False
         payload_model = _normalise_fact_payload({}, fallback_text=text)
         logger.exception(
             "crm_fact_extraction_failed",
@@ -508,11 +1082,107 @@ Instructions:
         )
 
     payload: Dict[str, Any] = payload_model.model_dump()
-    if parsed is None:
+    if not grounded:
         payload["raw_text"] = excerpt
     return payload
 
 
+def extract_crm_facts_bulk(items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Derive CRM facts for several sources with one model call per batch.
+
+    Each item carries the keyword arguments of `extract_crm_facts_from_text`
+    (plus `text`). Results come back in input order. A batch whose reply
+    cannot be matched back to its sources falls back to one call per item.
+    """
+    if not fact_extraction_enabled():
+        raise RuntimeError("Fact extraction is disabled.")
+    results: List[Dict[str, Any]] = []
+    for offset in range(0, len(items), _CRM_FACT_BATCH_SIZE):
+        results.extend(_extract_crm_fact_batch(items[offset : offset + _CRM_FACT_BATCH_SIZE]))
+    return results
+
+
+def _extract_crm_fact_batch(batch: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    documents = [
+        {
+            "id": index,
+            "contact_name": item.get("contact_name") or "(unclear)",
+            "contact_company": item.get("contact_company") or "(unclear)",
+            "contact_email": item.get("contact_email") or "(unclear)",
+            "source_type": item["source_type"],
+            "source_date": item.get("source_date") or "(unclear)",
+            "text": item["text"].strip(),
+        }
+        for index, item in enumerate(batch)
+    ]
+    prompt = f"""
+You are CRM_FACT_EXTRACTOR. Turn each provided source into grounded CRM facts Adam can reuse later.
+
+Sources (JSON array; each entry is independent):
+{json.dumps(documents, ensure_ascii=False, indent=1)}
+
+Instructions:
+- Work only with each source's own text; mark gaps with "(unclear)".
+- Output one valid JSON array (no comments, code fences, or prose) with exactly one object per source, in the same order.
+- Each object must include the source "id" plus the fields of this schema:
+{_CRM_FACT_SCHEMA}
+- Prefer concise, factual language and reuse "(unclear)" when evidence is missing.
+- If nothing concrete is present, set intent="unclear" and leave other fields null or "(unclear)".
+""".strip()
+
+    start = time.perf_counter()
+    entries: Optional[Dict[int, Dict[str, Any]]] = None
+    try:
+        response = _invoke_model(prompt, model=_SUMMARISER_MODEL, system_message=ADAM_GLOBAL_STYLE)
+        entries = _match_fact_batch(_best_effort_json_array(response), len(batch))
+    except Exception:
+        logger.exception("crm_fact_batch_failed", extra={"batch_size": len(batch)})
+    finally:
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        logger.info(
+            "crm_fact_batch_complete",
+            extra={
+                "batch_size": len(batch),
+                "model": _SUMMARISER_MODEL,
+                "duration_ms": duration_ms,
+                "success": entries is not None,
+            },
+        )
+
+    if entries is None:
+        return [
+            extract_crm_facts_from_text(item["text"], **{k: v for k, v in item.items() if k != "text"})
+            for item in batch
+        ]
+    return [
+        _normalise_fact_payload(entries[index], fallback_text=item["text"]).model_dump()
+        for index, item in enumerate(batch)
+    ]
+
+
+def _match_fact_batch(
+    parsed: Optional[List[Any]], expected: int
+) -> Optional[Dict[int, Dict[str, Any]]]:
+    """Key batch results by source id, or None if any source is missing."""
+    if parsed is None:
+        return None
+    entries = {
+        entry["id"]: entry
+        for entry in parsed
+        if isinstance(entry, dict) and isinstance(entry.get("id"), int)
+    }
+    if any(index not in entries for index in range(expected)):
+        return None
+    return entries
+
+
+def _json_block(rows: List[Dict[str, Any]], *, empty: str) -> str:
+    """Serialise prompt rows in one orjson call; dates are emitted as ISO strings."""
+    if not rows:
+        return empty
+    return orjson.dumps(rows).decode("utf-8")
+
+
 def suggest_next_action_for_contact(
     contact: models.Contact,
     interactions: Sequence[models.Interaction],
@@ -522,41 +1192,51 @@ def suggest_next_action_for_contact(
     """Generate a next-action recommendation grounded in recent history."""
     if not suggestions_feature_enabled():
         raise RuntimeError("Next action suggestions are disabled.")
-    interaction_lines = []
-    for interaction in interactions:
-        timestamp = interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else "(undated)"
-        summary = _shorten_snippet(interaction.summary, limit=180)
-        outcome = (interaction.outcome or "pending").replace("_", " ")
-        action = _shorten_snippet(interaction.next_action, limit=120) if interaction.next_action else "-"
-        due = interaction.next_action_due.strftime("%Y-%m-%d") if interaction.next_action_due else "-"
-        interaction_lines.append(
-            f"- {timestamp}: {interaction.type} | outcome={outcome} | next_action={action} (due {due}) | {summary}"
-        )
-    interactions_block = "\n".join(interaction_lines) if interaction_lines else "(No recent interactions)"
-
-    note_lines = []
-    for note in notes:
-        meeting_date = note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else "(undated)"
-        structured = _shorten_snippet(note.processed_summary, limit=220) if note.processed_summary else None
-        raw = _shorten_snippet(note.raw_notes, limit=220)
-        note_lines.append(f"- {meeting_date}: structured={structured or '(none)'} | raw={raw}")
-    notes_block = "\n".join(note_lines) if note_lines else "(No recent notes)"
-
-    fact_lines = []
-    for fact in facts:
-        payload = fact.fact_payload or {}
-        intent = payload.get("intent") or "unclear"
-        timeline = payload.get("timeline") or "unknown"
-        summary = _shorten_snippet(payload.get("summary"), limit=220, placeholder="(unclear)")
-        hint = _shorten_snippet(payload.get("next_action_hint"), limit=160, placeholder="(none)")
-        fact_lines.append(f"- intent={intent}, timeline={timeline}, summary={summary} | hint={hint}")
-    facts_block = "\n".join(fact_lines) if fact_lines else "(No structured facts yet)"
+    interactions_block = _json_block(
+        [
+            {
+                "date": interaction.timestamp.date() if interaction.timestamp else None,
+                "type": interaction.type,
+                "outcome": (interaction.outcome or "pending").replace("_", " "),
+                "next_action": shorten_snippet(interaction.next_action, limit=120, placeholder="") or None,
+                "next_action_due": interaction.next_action_due,
+                "summary": shorten_snippet(interaction.summary, limit=180),
+            }
+            for interaction in interactions
+        ],
+        empty="(No recent interactions)",
+    )
+    notes_block = _json_block(
+        [
+            {
+                "date": note.meeting_date,
+                "structured": shorten_snippet(note.processed_summary, limit=220, placeholder="") or None,
+                "raw": shorten_snippet(note.raw_notes, limit=220),
+            }
+            for note in notes
+        ],
+        empty="(No recent notes)",
+    )
+    facts_block = _json_block(
+        [
+            {
+                "intent": payload.get("intent") or "unclear",
+                "timeline": payload.get("timeline") or "unknown",
+                "summary": shorten_snippet(payload.get("summary"), limit=220, placeholder="(unclear)"),
+                "hint": shorten_snippet(payload.get("next_action_hint"), limit=160, placeholder="(none)"),
+            }
+            for payload in (fact.fact_payload or {} for fact in facts)
+        ],
+        empty="(No structured facts yet)",
+    )
 
     prompt = f"""
 You are NEXT_ACTION_COACH. Recommend Adam Phillips' most useful next action based on the context below.
 
 Contact: {contact.name} ({contact.role}) at {contact.company_name}
 
+Each history block below is a JSON array (newest first) or a placeholder when empty.
+
 Recent interactions:
 {interactions_block}
 
@@ -588,8 +1268,9 @@ Guidance:
     start = time.perf_counter()
     try:
         response = _invoke_model(prompt, model=_DRAFTING_MODEL, system_message=ADAM_GLOBAL_STYLE)
-        parsed = _best_effort_json_loads(response)
-        suggestion = _normalise_next_action_payload(parsed or {})
+        suggestion = _validate_next_action_json(response) or _normalise_next_action_payload(
+            _best_effort_json_loads(response) or {}
+        )
         success = True
     except Exception:
         logger.exception(
@@ -616,6 +1297,111 @@ Guidance:
     return suggestion.model_dump(mode="json")
 
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@lru_cache(maxsize=1)
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for the blocking bulk helpers below."""
+    return ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_CALLS, thread_name_prefix="atlas-llm")
+
+
+def _map_concurrently(fn: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+    """Run `fn` over `items` on the shared pool, preserving input order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(_get_executor().map(fn, items))
+
+
+def suggest_next_actions_bulk(
+    items: Sequence[
+        Tuple[
+            models.Contact,
+            Sequence[models.Interaction],
+            Sequence[models.Note],
+            Sequence["models.CRMFact"],
+        ]
+    ],
+) -> List[Dict[str, Any]]:
+    """Run `suggest_next_action_for_contact` for several contacts at once.
+
+    Each item is the `(contact, interactions, notes, facts)` tuple the single
+    call takes. The first failure is re-raised, as with the single call.
+    """
+    return _map_concurrently(lambda item: suggest_next_action_for_contact(*item), items)
+
+
+def draft_followup_emails(
+    items: Sequence[Tuple[models.Contact, Sequence[models.Interaction], Sequence[models.Note]]],
+) -> List[str]:
+    """Run `draft_followup_email` for several contacts at once."""
+    return _map_concurrently(lambda item: draft_followup_email(*item), items)
+
+
+async def afetch_and_summarise_websites(targets: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+    """Summarise several `(url, company_name)` homepages concurrently on one event loop.
+
+    Fetches share the pooled httpx client and at most `_MAX_CONCURRENT_CALLS`
+    sites are in flight. A site that cannot be fetched or summarised yields
+    None so one dead homepage does not sink the whole ingest run.
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CALLS)
+
+    async def _summarise(target: Tuple[str, str]) -> Optional[str]:
+        async with semaphore:
+            try:
+                return await afetch_and_summarise_website(*target)
+            except Exception:
+                logger.warning("website_summary_failed", extra={"url": target[0]})
+                return None
+
+    return list(await asyncio.gather(*(_summarise(target) for target in targets)))
+
+
+def fetch_and_summarise_websites(targets: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+    """Blocking wrapper around `afetch_and_summarise_websites` for sync routes and scripts.
+
+    Must not be called from inside a running event loop.
+    """
+    if not targets:
+        return []
+    return _run_blocking(afetch_and_summarise_websites(targets))
+
+
+def _validate_fact_json(response: str) -> Optional[schemas.CRMFactPayload]:
+    """Parse and validate a bare JSON reply in one pass.
+
+    Returns None whenever the reply needs the lenient path: prose or code
+    fences around the JSON, out-of-vocabulary enums, or blank/padded strings
+    that `_normalise_fact_payload` would rewrite.
+    """
+    try:
+        payload = schemas.CRMFactPayload.model_validate_json(response)
+    except ValidationError:
+        return None
+    if "summary" not in payload.model_fields_set:
+        return None
+    for value in payload.model_dump().values():
+        if isinstance(value, str) and (not value or value != value.strip()):
+            return None
+    return payload
+
+
+def _validate_next_action_json(response: str) -> Optional[schemas.NextActionSuggestion]:
+    """Single-pass validation for a bare JSON next-action reply."""
+    try:
+        suggestion = schemas.NextActionSuggestion.model_validate_json(response)
+    except ValidationError:
+        return None
+    blanks = {
+        field: ""
+        for field in ("proposed_email_subject", "proposed_email_body", "notes_for_adam")
+        if getattr(suggestion, field) is None
+    }
+    return suggestion.model_copy(update=blanks) if blanks else suggestion
+
+
 def _normalise_fact_payload(candidate: Dict[str, Any], *, fallback_text: str) -> schemas.CRMFactPayload:
     payload = dict(_CRM_FACT_TEMPLATE)
     candidate = candidate or {}
@@ -628,21 +1414,21 @@ def _normalise_fact_payload(candidate: Dict[str, Any], *, fallback_text: str) ->
             continue
         payload[key] = value
 
-    if payload["intent"] not in _VALID_INTENTS:
-        payload["intent"] = "unclear"
-    if payload["timeline"] not in _VALID_TIMELINES:
-        payload["timeline"] = "unknown"
+    intent = payload["intent"]
+    payload["intent"] = intent if intent in _VALID_INTENTS else _INTENT_DEFAULT
+    timeline = payload["timeline"]
+    payload["timeline"] = timeline if timeline in _VALID_TIMELINES else _TIMELINE_DEFAULT
     if not isinstance(payload["summary"], str):
         payload["summary"] = ""
     if payload["summary"]:
         payload["summary"] = payload["summary"].strip()
     else:
-        payload["summary"] = _shorten_snippet(fallback_text, limit=200, placeholder="(unclear)")
+        payload["summary"] = shorten_snippet(fallback_text, limit=200, placeholder="(unclear)")
 
     try:
         return schemas.CRMFactPayload(**payload)
     except ValidationError:
-        return schemas.CRMFactPayload(**_CRM_FACT_TEMPLATE, summary=_shorten_snippet(fallback_text, limit=200, placeholder="(unclear)"))
+        return schemas.CRMFactPayload(**_CRM_FACT_TEMPLATE, summary=shorten_snippet(fallback_text, limit=200, placeholder="(unclear)"))
 
 
 def _normalise_next_action_payload(candidate: Dict[str, Any]) -> schemas.NextActionSuggestion:
@@ -676,42 +1462,108 @@ def _best_effort_json_loads(text: str) -> Optional[Dict[str, Any]]:
     """Parse JSON even if the model wrapped it in prose or code fences."""
     if not text:
         return None
-    candidates = []
     trimmed = text.strip()
-    candidates.append(trimmed)
+    # Models usually honour the "JSON only" instruction, so try the bare reply
+    # before paying for fence stripping or brace scanning. Each fallback is
+    # tried as soon as it is cut, so no candidate list is built.
+    parsed = _try_orjson(trimmed)
+    if parsed is not None:
+        return parsed
 
     if trimmed.startswith("```"):
         lines = trimmed.splitlines()
         fence_removed = "\n".join(lines[1:])
         if fence_removed.endswith("```"):
             fence_removed = "\n".join(fence_removed.splitlines()[:-1])
-        candidates.append(fence_removed.strip())
+        parsed = _try_orjson(fence_removed.strip())
+        if parsed is not None:
+            return parsed
 
     start = trimmed.find("{")
     end = trimmed.rfind("}")
     if start != -1 and end != -1 and end > start:
-        candidates.append(trimmed[start : end + 1])
-
-    for candidate in candidates:
-        try:
-            return json.loads(candidate)
-        except (json.JSONDecodeError, TypeError):
-            continue
+        return _try_orjson(trimmed[start : end + 1])
     return None
 
+
+def _try_orjson(candidate: str) -> Any:
+    try:
+        return orjson.loads(candidate)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _best_effort_json_array(text: str) -> Optional[List[Any]]:
+    """Parse a JSON array even if the model wrapped it in prose or code fences."""
+    if not text:
+        return None
+    trimmed = text.strip()
+    start = trimmed.find("[")
+    end = trimmed.rfind("]")
+    if start == -1 or end <= start:
+        return None
+    parsed = _try_orjson(trimmed[start : end + 1])
+    return parsed if isinstance(parsed, list) else None
+
+
 def summarise_note(note: models.Note, contact: models.Contact) -> str:
     """Produce a structured summary of raw meeting notes."""
-    meeting_date = note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else "(unclear)"
-    raw_notes = note.raw_notes.strip()
+    return _invoke_model(
+        _build_note_summary_prompt(note, contact),
+        model=_SUMMARISER_MODEL,
+        system_message=ADAM_GLOBAL_STYLE,
+        semantic_key=_note_semantic_key(note),
+    )
 
-    # BD_NOTES_SUMMARISER turns raw notes into structured sections Adam can scan quickly.
-    prompt = f"""
-You are BD_NOTES_SUMMARISER. Convert the raw notes into a neutral, structured summary for Adam Phillips.
 
-Contact: {contact.name} ({contact.company_name})
-Meeting date: {meeting_date}
-Raw notes:
-{raw_notes}
+async def asummarise_note(note: models.Note, contact: models.Contact) -> str:
+    """Async twin of `summarise_note`."""
+    return await _ainvoke_model(
+        _build_note_summary_prompt(note, contact),
+        model=_SUMMARISER_MODEL,
+        system_message=ADAM_GLOBAL_STYLE,
+        semantic_key=_note_semantic_key(note),
+    )
+
+
+def summarise_notes(items: Sequence[Tuple[models.Note, models.Contact]]) -> List[str]:
+    """Summarise several `(note, contact)` pairs concurrently, in input order."""
+    calls = [
+        (_build_note_summary_prompt(note, contact), _SUMMARISER_MODEL, ADAM_GLOBAL_STYLE)
+        for note, contact in items
+    ]
+    return _invoke_model_many(calls)
+
+
+def submit_note_summary_batch(items: Sequence[Tuple[models.Note, models.Contact]]) -> str:
+    """Queue note summaries on the OpenAI Batch API; returns the batch id.
+
+    For bulk refreshes only: results arrive within 24 hours via
+    `note_summary_batch_results`, at half the synchronous price.
+    """
+    calls = [
+        (f"note-{note.id}", _build_note_summary_prompt(note, contact), _SUMMARISER_MODEL, ADAM_GLOBAL_STYLE)
+        for note, contact in items
+    ]
+    return llm_batch.submit_batch(_get_client(), calls)
+
+
+def note_summary_batch_results(batch_id: str) -> Tuple[str, Optional[Dict[int, str]]]:
+    """Return `(status, {note_id: summary})`; the mapping is None until the batch completes."""
+    status, replies = llm_batch.batch_results(_get_client(), batch_id)
+    if replies is None:
+        return status, None
+    summaries: Dict[int, str] = {}
+    for custom_id, text in replies.items():
+        prefix, _, note_id = custom_id.partition("-")
+        if prefix == "note" and note_id.isdigit():
+            summaries[int(note_id)] = text
+    return status, summaries
+
+
+# BD_NOTES_SUMMARISER turns raw notes into structured sections Adam can scan quickly.
+_NOTE_SUMMARY_PREFIX = """
+You are BD_NOTES_SUMMARISER. Convert the raw notes provided after the divider below into a neutral, structured summary for Adam Phillips.
 
 Output the following sections, in this exact order. Each section must have 1-4 bullets, each <= 18 words:
 1. Context
@@ -730,17 +1582,91 @@ Rules:
 - Prefer short, scannable wording and reference data points only when provided.
 """.strip()
 
-    return _invoke_model(prompt, model=_SUMMARISER_MODEL, system_message=ADAM_GLOBAL_STYLE)
+
+def _note_semantic_key(note: models.Note) -> Tuple[str, str]:
+    # Scoped to one note and its meeting date: the summary quotes that date, so
+    # a near-identical note from another meeting must not reuse it.
+    scope = f"note:{note.id}:{_iso_date(note.meeting_date, '(unclear)')}"
+    return scope, note.raw_notes.strip()
+
+
+def _build_note_summary_prompt(note: models.Note, contact: models.Contact) -> str:
+    meeting_date = _iso_date(note.meeting_date, "(unclear)")
+    raw_notes = note.raw_notes.strip()
+    note_block = f"""
+Contact: {contact.name} ({contact.company_name})
+Meeting date: {meeting_date}
+Raw notes:
+{raw_notes}
+""".strip()
+    return "".join((_NOTE_SUMMARY_PREFIX, _PROMPT_DIVIDER, note_block))
 
 
-@lru_cache()
 def _get_client() -> OpenAI:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError(
             "OPENAI_API_KEY environment variable is required to generate email drafts."
         )
-    return OpenAI(api_key=api_key)
+    return _build_client(api_key, os.getenv("OPENAI_BASE_URL") or None)
+
+
+@lru_cache(maxsize=4)
+def _build_client(api_key: str, base_url: Optional[str]) -> OpenAI:
+    """Build one pooled client per credential set and reuse it for every call."""
+    import httpx
+    from openai import OpenAI
+
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=httpx.Timeout(**_OPENAI_TIMEOUT),
+        max_retries=_OPENAI_MAX_RETRIES,
+        http_client=httpx.Client(limits=httpx.Limits(**_OPENAI_POOL_LIMITS)),
+    )
+
+
+def warm_openai_client() -> Optional[threading.Thread]:
+    """Open the pooled OpenAI connection in the background at startup.
+
+    Opt-in via `ATLAS_WARM_OPENAI` so the first draft request does not pay
+    the TLS handshake. Failures are logged and otherwise ignored.
+    """
+    if not _flag_enabled("ATLAS_WARM_OPENAI", False) or not os.getenv("OPENAI_API_KEY"):
+        return None
+
+    def _warm() -> None:
+        try:
+            _get_client().models.list()
+        except Exception:
+            logger.warning("openai_warmup_failed")
+
+    thread = threading.Thread(target=_warm, name="atlas-openai-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _get_async_client() -> AsyncOpenAI:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError(
+            "OPENAI_API_KEY environment variable is required to generate email drafts."
+        )
+    base_url = os.getenv("OPENAI_BASE_URL") or None
+    return _loop_client(("openai", api_key, base_url), lambda: _build_async_client(api_key, base_url))
+
+
+def _build_async_client(api_key: str, base_url: Optional[str]) -> AsyncOpenAI:
+    import httpx
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=httpx.Timeout(**_OPENAI_TIMEOUT),
+        max_retries=_OPENAI_MAX_RETRIES,
+        http_client=httpx.AsyncClient(limits=httpx.Limits(**_OPENAI_POOL_LIMITS)),
+    )
 
 
 def _invoke_model(
@@ -748,108 +1674,323 @@ def _invoke_model(
     *,
     model: Optional[str] = None,
     system_message: Optional[str] = None,
+    json_schema: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+    semantic_key: Optional[Tuple[str, str]] = None,
 ) -> str:
-    """Call the OpenAI client, preferring the Responses API with a chat fallback.
+    """Call OpenAI chat completions and return the reply as one text blob.
+
+    Unexpected reply shapes are logged for easier debugging. When
+    `ATLAS_LLM_CACHE` is enabled, identical (model, system, prompt) calls are
+    served from the response cache (a per-process LRU in front of the
+    on-disk store) instead of the network; `use_cache=False` always goes to the network. Passing
+    `json_schema` (a `{"name", "schema"}` pair) turns on strict structured
+    output so the reply is guaranteed to be JSON matching that schema.
+
+    `semantic_key` is a `(scope, text)` pair. When `ATLAS_SEMANTIC_CACHE` is
+    enabled and the exact cache misses, `text` is embedded and compared with
+    earlier calls in the same scope; a close enough match returns that
+    earlier reply. Only the variable input is embedded, because the shared
+    prompt scaffold would otherwise make unrelated calls look alike.
+    """
+    target_model = model or _DRAFTING_MODEL
+    system_prompt = system_message or _DEFAULT_SYSTEM_MESSAGE
+
+    cache_key = _response_cache_key(target_model, system_prompt, prompt) if use_cache else None
+    if cache_key:
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+    semantic: Optional[Tuple[str, List[float]]] = None
+    if use_cache and semantic_key and _flag_enabled("ATLAS_SEMANTIC_CACHE", False):
+        hit, semantic = _semantic_lookup(target_model, system_prompt, semantic_key)
+        if hit is not None:
+            _store_response(cache_key, hit)
+            return hit
+
+    text = _request_completion(prompt, target_model, system_prompt, json_schema=json_schema)
+    _store_response(cache_key, text)
+    if semantic and text:
+        _get_semantic_cache().add(semantic[0], semantic[1], text)
+    return text
+
+
+def _invoke_model_stream(
+    prompt: str,
+    *,
+    model: Optional[str] = None,
+    system_message: Optional[str] = None,
+    use_cache: bool = True,
+) -> Iterator[str]:
+    """Yield the model reply in small chunks as it is generated.
 
-    This function attempts to normalise several response shapes returned by
-    different `openai` SDK versions. It prefers the Responses API, then
-    falls back to chat completions. The goal is to return a single text
-    blob suitable for rendering into drafts while logging unexpected
-    shapes for easier debugging.
+    Cached replies are yielded in one piece, and a completed stream is
+    written back to the response cache so `_invoke_model` can reuse it.
     """
     target_model = model or _DRAFTING_MODEL
     system_prompt = system_message or _DEFAULT_SYSTEM_MESSAGE
+
+    cache_key = _response_cache_key(target_model, system_prompt, prompt) if use_cache else None
+    if cache_key:
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
     client: Any = _get_client()
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+    deltas = _chat_stream_deltas(
+        client.chat.completions.create(model=target_model, messages=messages, stream=True)
+    )
 
-    # Prefer Responses API when available
-    if hasattr(client, "responses"):
-        response: Any = client.responses.create(
-            model=target_model,
-            input=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ],
+    pieces: List[str] = []
+    for chunk in _coalesce_deltas(deltas):
+        pieces.append(chunk)
+        yield chunk
+    _store_response(cache_key, "".join(pieces).strip())
+
+
+def _chat_stream_deltas(stream: Iterable[Any]) -> Iterator[str]:
+    for event in stream:
+        choices = getattr(event, "choices", None)
+        if not choices:
+            continue
+        content = getattr(choices[0].delta, "content", None)
+        if content:
+            yield content
+
+
+def _coalesce_deltas(deltas: Iterable[str], *, min_chars: int = _STREAM_FLUSH_CHARS) -> Iterator[str]:
+    buffer: List[str] = []
+    size = 0
+    for delta in deltas:
+        buffer.append(delta)
+        size += len(delta)
+        if size >= min_chars:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+async def _ainvoke_model(
+    prompt: str,
+    *,
+    model: Optional[str] = None,
+    system_message: Optional[str] = None,
+    use_cache: bool = True,
+    semantic_key: Optional[Tuple[str, str]] = None,
+) -> str:
+    """Async twin of `_invoke_model` for callers that overlap several requests."""
+    target_model = model or _DRAFTING_MODEL
+    system_prompt = system_message or _DEFAULT_SYSTEM_MESSAGE
+
+    cache_key = _response_cache_key(target_model, system_prompt, prompt) if use_cache else None
+    if cache_key:
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+    semantic: Optional[Tuple[str, List[float]]] = None
+    if use_cache and semantic_key and _flag_enabled("ATLAS_SEMANTIC_CACHE", False):
+        # The embedding call and .npy I/O are blocking; keep them off the loop.
+        hit, semantic = await asyncio.to_thread(
+            _semantic_lookup, target_model, system_prompt, semantic_key
         )
+        if hit is not None:
+            _store_response(cache_key, hit)
+            return hit
 
-        # Frequently available convenience property
-        out_text = getattr(response, "output_text", None)
-        if out_text:
-            return str(out_text).strip()
+    text = await _arequest_completion(prompt, target_model, system_prompt)
+    _store_response(cache_key, text)
+    if semantic and text:
+        await asyncio.to_thread(_get_semantic_cache().add, semantic[0], semantic[1], text)
+    return text
 
-        # Try structured `output` payloads
-        raw = None
-        try:
-            raw = getattr(response, "output", None)
-        except Exception:
-            raw = None
 
-        if raw:
-            try:
-                # If it's a list, try to extract text pieces
-                if isinstance(raw, (list, tuple)):
-                    pieces = []
-                    for item in raw:
-                        if isinstance(item, dict):
-                            # nested content lists are common
-                            content = item.get("content") or item.get("text")
-                            if isinstance(content, list):
-                                for c in content:
-                                    if isinstance(c, dict) and c.get("type") == "output_text":
-                                        pieces.append(c.get("text", ""))
-                                    elif isinstance(c, str):
-                                        pieces.append(c)
-                            elif isinstance(content, str):
-                                pieces.append(content)
-                        elif isinstance(item, str):
-                            pieces.append(item)
-                    if pieces:
-                        return "\n".join(p.strip() for p in pieces if p).strip()
-
-                # If it's a dict, look for the first string value
-                if isinstance(raw, dict):
-                    for v in raw.values():
-                        if isinstance(v, str) and v.strip():
-                            return v.strip()
-            except Exception:
-                logger.debug("Unexpected Responses API output shape", exc_info=True)
+async def _ainvoke_model_many(calls: Sequence[Tuple[str, str, str]]) -> List[str]:
+    """Run several `(prompt, model, system_message)` calls concurrently.
 
-        # Fallback: stringify the whole response
-        try:
-            return str(response).strip()
-        except Exception:
-            return ""
+    Replies come back in input order; at most `_MAX_CONCURRENT_CALLS`
+    requests are in flight so bulk runs stay inside OpenAI rate limits.
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CALLS)
+
+    async def _one(call: Tuple[str, str, str]) -> str:
+        prompt, target_model, system_prompt = call
+        async with semaphore:
+            return await _ainvoke_model(prompt, model=target_model, system_message=system_prompt)
+
+    return list(await asyncio.gather(*(_one(call) for call in calls)))
+
+
+def _invoke_model_many(calls: Sequence[Tuple[str, str, str]]) -> List[str]:
+    """Blocking wrapper around `_ainvoke_model_many` for sync routes and scripts.
+
+    Must not be called from inside a running event loop; async callers
+    should await `_ainvoke_model_many` directly.
+    """
+    if not calls:
+        return []
+    return _run_blocking(_ainvoke_model_many(calls))
 
-    # Chat completions fallback (older client shapes)
-    if hasattr(client, "chat") and hasattr(client.chat, "completions"):
-        completion: Any = client.chat.completions.create(
-            model=target_model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt},
-            ],
-        )
 
-        # Try a couple of known shapes, otherwise stringify
+# httpx (and so AsyncOpenAI) connection pools are bound to the event loop that
+# opened them, so async clients are kept per running loop instead of in an
+# lru_cache: the FastAPI loop keeps one set for its lifetime, while each
+# `_run_blocking` call gets fresh clients and closes them before its loop ends.
+_LOOP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Any, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_client(key: Any, factory: Callable[[], _R]) -> _R:
+    clients = _LOOP_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    if key not in clients:
+        clients[key] = factory()
+    return clients[key]
+
+
+async def aclose_clients() -> None:
+    """Close the async HTTP and OpenAI clients opened on the running event loop."""
+    clients = _LOOP_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        close = getattr(client, "aclose", None) or client.close
+        await close()
+
+
+def _run_blocking(coro: Coroutine[Any, Any, _R]) -> _R:
+    """Run `coro` on a fresh event loop, closing that loop's clients afterwards."""
+
+    async def _main() -> _R:
         try:
-            choice = completion.choices[0]
-            message = getattr(choice, "message", None)
-            content = getattr(message, "content", None) if message else None
-            if isinstance(content, str):
-                return content.strip()
-            if isinstance(choice, dict):
-                maybe_content = choice.get("message", {}).get("content")
-                if isinstance(maybe_content, str):
-                    return maybe_content.strip()
-        except Exception:
-            try:
-                return str(completion).strip()
-            except Exception:
-                logger.debug("Unexpected chat completion shape", exc_info=True)
-                try:
-                    return str(completion).strip()
-                except Exception:
-                    return ""
+            return await coro
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(_main())
+
+
+@lru_cache(maxsize=1)
+def _get_response_cache() -> llm_cache.CacheBackend:
+    # Hot prompts are answered from memory; the file tier survives restarts
+    # and is shared by every worker on the host.
+    return llm_cache.TieredCache(
+        llm_cache.MemoryCache(maxsize=512, ttl=llm_cache.default_ttl()),
+        llm_cache.FileCache(llm_cache.default_cache_dir()),
+    )
 
-    raise RuntimeError(
-        "Installed OpenAI SDK does not support Responses or ChatCompletion APIs required for drafting."
+
+def _response_cache_key(target_model: str, system_prompt: str, prompt: str) -> Optional[str]:
+    if not _flag_enabled("ATLAS_LLM_CACHE", False):
+        return None
+    return llm_cache.make_key(target_model, system_prompt, prompt)
+
+
+@lru_cache(maxsize=1)
+def _get_semantic_cache() -> Any:
+    from . import semantic_cache
+
+    return semantic_cache.SemanticCache(
+        semantic_cache.default_cache_dir(), threshold=semantic_cache.default_threshold()
     )
+
+
+def _semantic_lookup(
+    target_model: str, system_prompt: str, semantic_key: Tuple[str, str]
+) -> Tuple[Optional[str], Optional[Tuple[str, List[float]]]]:
+    """Return (cached reply or None, (namespace, embedding) for a later add)."""
+    scope, text = semantic_key
+    namespace = llm_cache.make_key(target_model, system_prompt, scope)[:32]
+    try:
+        embedding = _embed_text(text)
+    except Exception:
+        # The semantic tier is an optimisation; an embedding outage must not
+        # block the real call.
+        logger.warning("semantic_cache_embed_failed", extra={"model": _EMBEDDING_MODEL})
+        return None, None
+    return _get_semantic_cache().lookup(namespace, embedding), (namespace, embedding)
+
+
+def _embed_text(text: str) -> List[float]:
+    response: Any = _get_client().embeddings.create(model=_EMBEDDING_MODEL, input=text)
+    return list(response.data[0].embedding)
+
+
+def _cached_response(cache_key: str) -> Optional[str]:
+    cached = _get_response_cache().get(cache_key)
+    _RESPONSE_CACHE_STATS.record(cached is not None)
+    return cached
+
+
+def response_cache_stats() -> Dict[str, int]:
+    """Hit/miss counts for the exact-match response cache since this process started."""
+    return _RESPONSE_CACHE_STATS.snapshot()
+
+
+def _store_response(cache_key: Optional[str], text: str) -> None:
+    if cache_key and text:
+        _get_response_cache().set(cache_key, text, ttl=llm_cache.default_ttl())
+
+
+def _request_completion(
+    prompt: str,
+    target_model: str,
+    system_prompt: str,
+    *,
+    json_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Send one prompt to OpenAI and normalise the reply to plain text."""
+    client: Any = _get_client()
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+    # The pinned SDK (openai 1.51) predates the Responses API, so every call
+    # goes through chat completions.
+    extra: Dict[str, Any] = {}
+    if json_schema:
+        extra["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"strict": True, **json_schema},
+        }
+    completion: Any = client.chat.completions.create(model=target_model, messages=messages, **extra)
+    return _chat_text_or_error(completion)
+
+
+async def _arequest_completion(prompt: str, target_model: str, system_prompt: str) -> str:
+    client: Any = _get_async_client()
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+    completion: Any = await client.chat.completions.create(model=target_model, messages=messages)
+    return _chat_text_or_error(completion)
+
+
+def _chat_text_or_error(completion: Any) -> str:
+    text = _extract_chat_text(completion)
+    if text is None:
+        raise RuntimeError("OpenAI chat completion returned no text content.")
+    return text
+
+
+def _extract_chat_text(completion: Any) -> Optional[str]:
+    """Return the first choice's text, or None when it carries no text content."""
+    choices = getattr(completion, "choices", None)
+    if not choices:
+        logger.debug("Unexpected chat completion shape: %s", type(completion).__name__)
+        return str(completion).strip()
+    choice = choices[0]
+    if isinstance(choice, dict):
+        content = (choice.get("message") or {}).get("content")
+    else:
+        content = getattr(getattr(choice, "message", None), "content", None)
+    return content.strip() if isinstance(content, str) else None
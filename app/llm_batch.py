@@ -0,0 +1,78 @@
+"""OpenAI Batch API helpers for the non-interactive workloads in `app.llm`.
+
+Batch jobs finish within 24 hours at half the per-token price and do not count
+against the synchronous rate limits, so bulk refreshes go through here rather
+than through `_invoke_model_many`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Chat completions is accepted by the Batch API for every model ATLAS uses and
+# is the only completion API in the pinned SDK, so interactive calls use it too.
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+
+def build_batch_jsonl(calls: Sequence[Tuple[str, str, str, str]]) -> bytes:
+    """Encode `(custom_id, prompt, model, system_message)` calls as Batch API JSONL."""
+    lines = []
+    for custom_id, prompt, model, system_message in calls:
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        row = {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+        lines.append(json.dumps(row))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def submit_batch(client: Any, calls: Sequence[Tuple[str, str, str, str]]) -> str:
+    """Upload the calls and start a batch job; returns the batch id."""
+    payload = build_batch_jsonl(calls)
+    upload = client.files.create(file=("atlas-batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=upload.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    return str(batch.id)
+
+
+def batch_results(client: Any, batch_id: str) -> Tuple[str, Optional[Dict[str, str]]]:
+    """Return `(status, replies)`; replies is None until the batch has completed.
+
+    Replies map `custom_id` to the reply text. Requests that errored inside a
+    completed batch are left out so callers can resubmit them later.
+    """
+    batch = client.batches.retrieve(batch_id)
+    status = str(batch.status)
+    if status != "completed":
+        return status, None
+    if not batch.output_file_id:
+        return status, {}
+    return status, parse_batch_output(client.files.content(batch.output_file_id).text)
+
+
+def parse_batch_output(text: str) -> Dict[str, str]:
+    replies: Dict[str, str] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        response = row.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        content = (choices[0].get("message") or {}).get("content") if choices else None
+        if isinstance(content, str) and content.strip():
+            replies[str(row.get("custom_id"))] = content.strip()
+    return replies
@@ -0,0 +1,152 @@
+"""Response caches used by `app.llm` to avoid re-sending identical prompts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Tuple
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        ...
+
+
+def make_key(model: str, system_message: str, prompt: str) -> str:
+    """Return a stable digest for one model call."""
+    payload = json.dumps({"m": model, "s": system_message, "p": prompt}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FileCache:
+    """Store each cached response as a small JSON file named after its key."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        value = entry.get("value")
+        return value if isinstance(value, str) else None
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        path = self._path(key)
+        entry = {
+            "expires_at": time.time() + ttl if ttl else None,
+            "value": value,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file.
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle)
+            os.replace(tmp_name, path)
+        except OSError:
+            # Caching is best-effort; a read-only disk must never break drafting.
+            return
+
+
+class MemoryCache:
+    """Per-process LRU with per-entry expiry, safe to share between threads."""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[int] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class TieredCache:
+    """Check a fast cache before a slower shared one, promoting slow-tier hits."""
+
+    def __init__(self, fast: CacheBackend, slow: CacheBackend) -> None:
+        self.fast = fast
+        self.slow = slow
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.fast.get(key)
+        if value is None:
+            value = self.slow.get(key)
+            if value is not None:
+                self.fast.set(key, value)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self.fast.set(key, value, ttl)
+        self.slow.set(key, value, ttl)
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters for one cache."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def default_cache_dir() -> Path:
+    configured = os.getenv("ATLAS_LLM_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(tempfile.gettempdir()) / "atlas-llm-cache"
+
+
+def default_ttl() -> int:
+    try:
+        return int(os.getenv("ATLAS_LLM_CACHE_TTL", "86400"))
+    except ValueError:
+        return 86400
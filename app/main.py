@@ -1,25 +1,81 @@
 import logging
 import os
 import time
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Sequence, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
+from anyio import to_thread
 from fastapi import Body, Depends, FastAPI, Form, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import and_, func, or_
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, contains_eager, joinedload, load_only, raiseload, selectinload
 from pydantic import ValidationError
 
 from . import llm, models, schemas
-from .database import get_db
+from .database import POOL_CAPACITY, get_db
 from .services import contacts as contact_service
 from .services import interactions as interaction_service
 
 
-app = FastAPI(title="ATLAS - AI Toolkit for Lead Activation & Stewardship")
-templates = Jinja2Templates(directory="app/templates")
+def _threadpool_size() -> int:
+    # One thread per pooled connection by default: a sync route holds a
+    # connection for most of its run, so threads beyond the pool's capacity
+    # would only wait out pool_timeout. Larger overrides are clamped to it.
+    try:
+        requested = max(1, int(os.getenv("ATLAS_THREADPOOL_SIZE", str(POOL_CAPACITY))))
+    except ValueError:
+        return POOL_CAPACITY
+    if requested > POOL_CAPACITY:
+        logger.warning(
+            "threadpool_size_clamped",
+            extra={"requested": requested, "pool_capacity": POOL_CAPACITY},
+        )
+        return POOL_CAPACITY
+    return requested
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    # Sync routes and the async routes' DB work run on AnyIO's worker threads
+    # (40 by default); match them to the connection pool instead.
+    to_thread.current_default_thread_limiter().total_tokens = _threadpool_size()
+    llm.warm_openai_client()
+    # Compile every template up front so no user request pays the parse.
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+    yield
+    await llm.aclose_clients()
+
+
+app = FastAPI(title="ATLAS - AI Toolkit for Lead Activation & Stewardship", lifespan=_lifespan)
+
+def _template_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # Entries are keyed by a checksum of the template source, so edited
+    # templates are recompiled rather than served stale.
+    directory = os.getenv("ATLAS_TEMPLATE_CACHE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory, pattern="atlas_%s.cache")
+
+
+# With ATLAS_TEMPLATE_RELOAD=false, compiled templates are reused without
+# stat-ing their source files on every render; leave it on while editing them.
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=True,
+        auto_reload=os.getenv("ATLAS_TEMPLATE_RELOAD", "true").lower() in {"1", "true", "yes", "on"},
+        bytecode_cache=_template_bytecode_cache(),
+    )
+)
 logger = logging.getLogger("atlas.app")
 
 
@@ -46,6 +102,32 @@ CUSTOM_EMAIL_TONES = [
     ("formal", "Formal"),
     ("enthusiastic", "Upbeat"),
 ]
+VALID_CUSTOM_EMAIL_PURPOSES = frozenset(value for value, _ in CUSTOM_EMAIL_PURPOSES)
+VALID_CUSTOM_EMAIL_TONES = frozenset(value for value, _ in CUSTOM_EMAIL_TONES)
+# Upper bound on contacts per /contacts/batch_draft call; drafts run at most
+# llm._MAX_CONCURRENT_CALLS at a time, so larger batches only queue.
+BATCH_DRAFT_LIMIT = 50
+# /metrics/outcomes is polled far more often than interactions change, so its
+# counts are kept for up to OUTCOME_METRICS_TTL seconds under a version that
+# every interaction write in this worker bumps; other workers catch up within
+# the TTL.
+OUTCOME_METRICS_TTL = 30.0
+_outcome_metrics_version = 0
+_outcome_metrics_cache: Dict[int, Tuple[float, List[Dict[str, object]]]] = {}
+# The contacts list is re-opened far more often than contacts change, so its
+# rendered HTML is kept per (status, search) for up to CONTACTS_LIST_TTL
+# seconds; contact writes in this worker drop every entry, and other workers
+# catch up within the TTL.
+CONTACTS_LIST_TTL = 30.0
+CONTACTS_LIST_CACHE_SIZE = 256
+_contacts_list_version = 0
+_contacts_list_cache: Dict[Tuple[int, str, str], Tuple[float, bytes]] = {}
+# Interactions/notes shown on the contact page until "Show full history" is
+# clicked, so long-running relationships don't make every visit scan them all.
+CONTACT_HISTORY_LIMIT = 50
+# Interactions/notes listed as optional context on the custom email page; the
+# model only ever sees the ones ticked, so older history is rarely useful.
+CUSTOM_EMAIL_HISTORY_LIMIT = 50
 DEFAULT_CUSTOM_EMAIL_FORM = {
     "purpose": "intro",
     "tone": "warm",
@@ -58,44 +140,25 @@ def parse_date_or_error(value: Optional[str], *, field_name: str, fmt: str = "%Y
     if not value:
         return None, None
     try:
-        parsed = datetime.strptime(value, fmt).date()
+        # HTML date inputs always submit YYYY-MM-DD; date.fromisoformat parses
+        # that in C, while strptime goes through the pure-Python _strptime
+        # module. Anything else (e.g. unpadded "2025-3-4") keeps strptime's rules.
+        if fmt == "%Y-%m-%d" and len(value) == 10 and value[4] == value[7] == "-":
+            parsed = date.fromisoformat(value)
+        else:
+            parsed = datetime.strptime(value, fmt).date()
     except ValueError:
         return None, f"Invalid date format for {field_name}."
     return parsed, None
 
 
-def _infer_first_name(full_name: str) -> Optional[str]:
-    if not full_name:
-        return None
-    parts = [part for part in full_name.strip().split(" ") if part]
-    return parts[0] if parts else None
-
-
-def _build_greeting(contact: models.Contact) -> str:
-    first_name = _infer_first_name(contact.name)
-    if first_name:
-        return f"Hi {first_name},"
-    if contact.name:
-        return f"Hi {contact.name},"
-    return "Hi there,"
-
-
-def _shorten_for_context(value: Optional[str], *, limit: int = 160, placeholder: str = "(unclear)") -> str:
-    if not value:
-        return placeholder
-    compact = " ".join(value.split())
-    if len(compact) <= limit:
-        return compact
-    return compact[: limit - 3].rstrip() + "..."
-
-
 def _format_selected_interaction_lines(interactions: Sequence[models.Interaction]) -> str:
     lines = []
     for interaction in interactions:
-        timestamp = interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else "(undated)"
+        timestamp = interaction.timestamp.isoformat()[:10] if interaction.timestamp else "(undated)"
         interaction_type = (interaction.type or "interaction").replace("_", " ")
         outcome = interaction.outcome or "(unclear)"
-        summary = _shorten_for_context(interaction.summary, limit=150)
+        summary = llm.shorten_snippet(interaction.summary, limit=150)
         lines.append(f"- {timestamp}: {interaction_type} | outcome={outcome} | {summary}")
     return "\n".join(lines)
 
@@ -103,10 +166,10 @@ def _format_selected_interaction_lines(interactions: Sequence[models.Interaction
 def _format_selected_note_lines(notes: Sequence[models.Note]) -> str:
     lines = []
     for note in notes:
-        meeting_date = note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else "(undated)"
+        meeting_date = note.meeting_date.isoformat()[:10] if note.meeting_date else "(undated)"
         structured = note.processed_summary.strip() if note.processed_summary else ""
-        structured = _shorten_for_context(structured, limit=150, placeholder="") if structured else ""
-        raw_excerpt = _shorten_for_context(note.raw_notes, limit=140)
+        structured = llm.shorten_snippet(structured, limit=150, placeholder="") if structured else ""
+        raw_excerpt = llm.shorten_snippet(note.raw_notes, limit=140)
         if structured:
             lines.append(f"- {meeting_date}: structured: {structured} / raw: {raw_excerpt}")
         else:
@@ -157,7 +220,6 @@ def _maybe_extract_fact(
             )
             db.add(existing)
         db.commit()
-        db.refresh(existing)
     except Exception as exc:
         db.rollback()
         logger.warning(
@@ -171,19 +233,75 @@ def _maybe_extract_fact(
         )
 
 
+def _missing_fact_query(db: Session, model, source_type: str):
+    # NOT EXISTS lets the planner probe idx_crm_facts_source per row instead of
+    # joining the whole crm_facts table and filtering for NULLs.
+    has_fact = (
+        db.query(models.CRMFact.id)
+        .filter(
+            models.CRMFact.source_type == source_type,
+            models.CRMFact.source_id == model.id,
+        )
+        .exists()
+    )
+    return db.query(model).filter(~has_fact)
+
+
+def _fact_source_item(
+    contact: models.Contact,
+    source_type: str,
+    source_id: int,
+    text: Optional[str],
+    when: Optional[datetime],
+) -> Dict:
+    return {
+        "text": text,
+        "contact_name": contact.name,
+        "contact_company": contact.company_name,
+        "contact_email": contact.email,
+        "source_type": source_type,
+        "source_date": when.isoformat()[:10] if when else None,
+        "contact_id": contact.id,
+        "source_id": source_id,
+    }
+
+
+def _store_bulk_facts(db: Session, items: List[Dict]) -> None:
+    """Extract facts for sources that have none yet and insert them in one commit."""
+    if not items:
+        return
+    try:
+        payloads = llm.extract_crm_facts_bulk(items)
+        db.add_all(
+            models.CRMFact(
+                contact_id=item["contact_id"],
+                source_type=item["source_type"],
+                source_id=item["source_id"],
+                fact_payload=payload,
+            )
+            for item, payload in zip(items, payloads)
+        )
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        logger.warning("fact_backfill_failed", extra={"sources": len(items)}, exc_info=exc)
+
+
 def _ensure_contact_exists(contact_id: int, db: Session) -> models.Contact:
-    contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
+    # Session.get checks the request-scoped identity map before querying, so a
+    # contact already loaded in this request (directly or via a relationship)
+    # costs no extra SELECT.
+    contact = db.get(models.Contact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
 
 
 def _get_interaction_with_contact(interaction_id: int, db: Session) -> models.Interaction:
-    interaction = (
-        db.query(models.Interaction)
-        .options(selectinload(models.Interaction.contact))
-        .filter(models.Interaction.id == interaction_id)
-        .first()
+    # Session.get reuses an interaction already in the identity map; on a miss
+    # the joined load fetches it and its contact in a single SELECT.
+    interaction = db.get(
+        models.Interaction, interaction_id, options=[joinedload(models.Interaction.contact)]
     )
     if not interaction:
         raise HTTPException(status_code=404, detail="Interaction not found")
@@ -191,30 +309,33 @@ def _get_interaction_with_contact(interaction_id: int, db: Session) -> models.In
 
 
 def _get_note_with_contact(note_id: int, db: Session) -> models.Note:
-    note = (
-        db.query(models.Note)
-        .options(selectinload(models.Note.contact))
-        .filter(models.Note.id == note_id)
-        .first()
-    )
+    note = db.get(models.Note, note_id, options=[joinedload(models.Note.contact)])
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     return note
 
 
-def _get_contact_with_history(contact_id: int, db: Session) -> models.Contact:
-    contact = (
-        db.query(models.Contact)
-        .options(
-            selectinload(models.Contact.interactions),
-            selectinload(models.Contact.notes),
-        )
-        .filter(models.Contact.id == contact_id)
-        .first()
+def _load_contact_history(
+    contact: models.Contact, db: Session, limit: Optional[int]
+) -> Tuple[List[models.Interaction], List[models.Note], bool]:
+    """Return the newest interactions and notes plus whether either was cut short."""
+    interactions_query = (
+        db.query(models.Interaction)
+        .filter(models.Interaction.contact_id == contact.id)
+        .order_by(models.Interaction.timestamp.desc())
     )
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    notes_query = (
+        db.query(models.Note)
+        .filter(models.Note.contact_id == contact.id)
+        .order_by(models.Note.meeting_date.desc())
+    )
+    if limit is None:
+        return interactions_query.all(), notes_query.all(), False
+    # One extra row per collection tells us whether a "show all" link is needed.
+    interactions = interactions_query.limit(limit + 1).all()
+    notes = notes_query.limit(limit + 1).all()
+    truncated = len(interactions) > limit or len(notes) > limit
+    return interactions[:limit], notes[:limit], truncated
 
 
 def _contact_form_context(request: Request, *, errors, form_data: Optional[Dict], contact: Optional[models.Contact] = None):
@@ -245,6 +366,24 @@ def _interaction_form_context(
     }
 
 
+@lru_cache(maxsize=1)
+def _default_due_for(day: date) -> str:
+    # Keyed by the calendar day so the cached value rolls over at midnight.
+    return (day + timedelta(days=7)).isoformat()
+
+
+def _stream_draft(chunks: Iterator[str]) -> StreamingResponse:
+    # Pull the first chunk eagerly so configuration and upstream failures still
+    # surface as HTTP errors rather than a truncated 200 response.
+    try:
+        first_chunk = next(chunks, "")
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Email drafting service unavailable: {exc}") from exc
+    return StreamingResponse(chain([first_chunk], chunks), media_type="text/plain; charset=utf-8")
+
+
 def _try_fetch_website_summary(contact: models.Contact) -> Optional[str]:
     if not contact.website_url:
         return None
@@ -256,6 +395,37 @@ def _try_fetch_website_summary(contact: models.Contact) -> Optional[str]:
         return None
 
 
+_Loaded = TypeVar("_Loaded")
+
+
+async def _load_then_release(db: Session, load: Callable[[], _Loaded]) -> _Loaded:
+    """Run sync ORM work on a worker thread, then hand the DB connection back.
+
+    Async routes call this before awaiting a model: the blocking driver calls
+    stay off the event loop, and closing the session returns its pooled
+    connection instead of holding it for the whole completion. The loaded
+    objects come back detached with their columns populated; touching an
+    unloaded relationship afterwards raises instead of querying on the loop.
+    """
+
+    def work() -> _Loaded:
+        try:
+            return load()
+        finally:
+            db.close()
+
+    return await run_in_threadpool(work)
+
+
+async def _atry_fetch_website_summary(contact: models.Contact) -> Optional[str]:
+    if not contact.website_url:
+        return None
+    try:
+        return await llm.afetch_and_summarise_website(contact.website_url, contact.company_name)
+    except Exception:
+        return None
+
+
 @app.get("/", include_in_schema=False)
 def root():
     return RedirectResponse(url="/contacts", status_code=303)
@@ -268,10 +438,31 @@ def list_contacts(
     q: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
-    query = db.query(models.Contact)
+    search_value = q.strip() if q else ""
+    # Read the version before querying so a render that races a contact write
+    # is stored under the old version and never served.
+    cache_key = (_contacts_list_version, status or "", search_value)
+    cached = _contacts_list_cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        return HTMLResponse(cached[1])
+
+    # The list shows a few scalar columns per row; skip hydrating the rest and
+    # fail loudly if the template ever starts touching a relationship.
+    query = db.query(models.Contact).options(
+        load_only(
+            models.Contact.id,
+            models.Contact.name,
+            models.Contact.company_name,
+            models.Contact.role,
+            models.Contact.status,
+            models.Contact.source,
+            models.Contact.created_at,
+            raiseload=True,
+        ),
+        raiseload("*"),
+    )
     if status:
         query = query.filter(models.Contact.status == status)
-    search_value = q.strip() if q else ""
     if search_value:
         like_value = f"%{search_value}%"
         query = query.filter(
@@ -281,7 +472,7 @@ def list_contacts(
             )
         )
     contacts = query.order_by(models.Contact.created_at.desc()).all()
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "contacts_list.html",
         {
             "request": request,
@@ -291,6 +482,10 @@ def list_contacts(
             "contact_statuses": CONTACT_STATUSES,
         },
     )
+    if len(_contacts_list_cache) >= CONTACTS_LIST_CACHE_SIZE:
+        _contacts_list_cache.clear()
+    _contacts_list_cache[cache_key] = (time.monotonic() + CONTACTS_LIST_TTL, bytes(response.body))
+    return response
 
 
 @app.get("/contacts/new")
@@ -341,6 +536,7 @@ def create_contact(
             "contact_form.html",
             _contact_form_context(request, errors=errors, form_data=form_data),
         )
+    _invalidate_contacts_list()
 
     return RedirectResponse(
         url=request.url_for("get_contact_detail", contact_id=contact.id),
@@ -403,6 +599,7 @@ def update_contact(
             "contact_edit_form.html",
             _contact_form_context(request, errors=errors, form_data=form_data, contact=contact),
         )
+    _invalidate_contacts_list()
 
     return RedirectResponse(
         url=request.url_for("get_contact_detail", contact_id=contact.id),
@@ -411,13 +608,23 @@ def update_contact(
 
 
 @app.get("/contacts/{contact_id}", name="get_contact_detail")
-def get_contact_detail(contact_id: int, request: Request, db: Session = Depends(get_db)):
-    contact = _get_contact_with_history(contact_id, db)
+def get_contact_detail(
+    contact_id: int,
+    request: Request,
+    history: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    contact = _ensure_contact_exists(contact_id, db)
+    limit = None if history == "all" else CONTACT_HISTORY_LIMIT
+    interactions, notes, history_truncated = _load_contact_history(contact, db, limit)
     return templates.TemplateResponse(
         "contact_detail.html",
         {
             "request": request,
             "contact": contact,
+            "recent_interactions": interactions,
+            "recent_notes": notes,
+            "history_truncated": history_truncated,
             "suggestions_enabled": llm.suggestions_feature_enabled(),
         },
     )
@@ -426,7 +633,7 @@ def get_contact_detail(contact_id: int, request: Request, db: Session = Depends(
 @app.get("/contacts/{contact_id}/interactions/new")
 def new_interaction_form(contact_id: int, request: Request, db: Session = Depends(get_db)):
     contact = _ensure_contact_exists(contact_id, db)
-    default_due = (date.today() + timedelta(days=7)).isoformat()
+    default_due = _default_due_for(date.today())
     form_data = {
         "interaction_type": INTERACTION_TYPES[0],
         "summary": "",
@@ -491,13 +698,14 @@ def create_interaction(
         )
 
     interaction = interaction_service.create_interaction(db, contact, interaction_in)
+    _invalidate_outcome_metrics()
     _maybe_extract_fact(
         db,
         contact=contact,
         source_type="interaction",
         source_id=interaction.id,
         text=summary,
-        source_date=interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else None,
+        source_date=interaction.timestamp.isoformat()[:10] if interaction.timestamp else None,
     )
 
     return RedirectResponse(
@@ -606,13 +814,14 @@ def update_interaction(
         return templates.TemplateResponse("interaction_form.html", context)
 
     interaction = interaction_service.update_interaction(db, interaction, interaction_in)
+    _invalidate_outcome_metrics()
     _maybe_extract_fact(
         db,
         contact=contact,
         source_type="interaction",
         source_id=interaction.id,
         text=summary,
-        source_date=interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else None,
+        source_date=interaction.timestamp.isoformat()[:10] if interaction.timestamp else None,
     )
 
     return RedirectResponse(
@@ -632,6 +841,7 @@ def delete_interaction(interaction_id: int, request: Request, db: Session = Depe
         raise HTTPException(status_code=404, detail="Interaction not found")
     contact_id = interaction.contact_id
     interaction_service.delete_interaction(db, interaction)
+    _invalidate_outcome_metrics()
     return RedirectResponse(
         url=request.url_for("get_contact_detail", contact_id=contact_id),
         status_code=303,
@@ -724,7 +934,7 @@ def create_note(
         source_type="note",
         source_id=note.id,
         text=raw_notes,
-        source_date=note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else None,
+        source_date=note.meeting_date.isoformat()[:10] if note.meeting_date else None,
     )
 
     return RedirectResponse(
@@ -793,101 +1003,79 @@ def apply_suggested_next_action(
     )
     db.add(interaction)
     db.commit()
+    _invalidate_outcome_metrics()
     return {"interaction_id": interaction.id}
 
 
+def _invalidate_outcome_metrics() -> None:
+    global _outcome_metrics_version
+    _outcome_metrics_version += 1
+
+
+def _invalidate_contacts_list() -> None:
+    global _contacts_list_version
+    _contacts_list_version += 1
+    _contacts_list_cache.clear()
+
+
+def _require_admin_token(token: str) -> None:
+    admin_token = os.getenv("INTEL_ADMIN_TOKEN")
+    if not admin_token or token != admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+
+
 @app.post("/admin/backfill_crm_facts")
 def backfill_crm_facts(
     token: str = Query(..., description="Admin token guarding the backfill route"),
     batch_size: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
 ):
-    admin_token = os.getenv("INTEL_ADMIN_TOKEN")
-    if not admin_token or token != admin_token:
-        raise HTTPException(status_code=403, detail="Invalid admin token.")
+    _require_admin_token(token)
     if not llm.fact_extraction_enabled():
         raise HTTPException(status_code=400, detail="Fact extraction is disabled.")
 
-    processed_notes = 0
-    processed_interactions = 0
-
     notes_to_process = (
-        db.query(models.Note)
-        .outerjoin(
-            models.CRMFact,
-            and_(
-                models.CRMFact.source_type == "note",
-                models.CRMFact.source_id == models.Note.id,
-            ),
-        )
-        .filter(models.CRMFact.id.is_(None))
+        _missing_fact_query(db, models.Note, "note")
+        .options(selectinload(models.Note.contact), raiseload("*"))
         .order_by(models.Note.meeting_date.desc())
         .limit(batch_size)
         .all()
     )
-    for note in notes_to_process:
-        contact = note.contact or _ensure_contact_exists(note.contact_id, db)
-        _maybe_extract_fact(
-            db,
-            contact=contact,
-            source_type="note",
-            source_id=note.id,
-            text=note.raw_notes,
-            source_date=note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else None,
-        )
-        processed_notes += 1
-        time.sleep(0.5)
-
     interactions_to_process = (
-        db.query(models.Interaction)
-        .outerjoin(
-            models.CRMFact,
-            and_(
-                models.CRMFact.source_type == "interaction",
-                models.CRMFact.source_id == models.Interaction.id,
-            ),
-        )
-        .filter(models.CRMFact.id.is_(None))
+        _missing_fact_query(db, models.Interaction, "interaction")
+        .options(selectinload(models.Interaction.contact), raiseload("*"))
         .order_by(models.Interaction.timestamp.desc())
         .limit(batch_size)
         .all()
     )
-    for interaction in interactions_to_process:
-        contact = interaction.contact or _ensure_contact_exists(interaction.contact_id, db)
-        _maybe_extract_fact(
-            db,
-            contact=contact,
-            source_type="interaction",
-            source_id=interaction.id,
-            text=interaction.summary,
-            source_date=interaction.timestamp.strftime("%Y-%m-%d") if interaction.timestamp else None,
+    items = [
+        _fact_source_item(note.contact, "note", note.id, note.raw_notes, note.meeting_date)
+        for note in notes_to_process
+    ] + [
+        _fact_source_item(
+            interaction.contact,
+            "interaction",
+            interaction.id,
+            interaction.summary,
+            interaction.timestamp,
         )
-        processed_interactions += 1
-        time.sleep(0.5)
+        for interaction in interactions_to_process
+    ]
+    _store_bulk_facts(db, [item for item in items if item["text"] and item["text"].strip()])
+    processed_notes = len(notes_to_process)
+    processed_interactions = len(interactions_to_process)
 
+    # with_entities keeps the COUNT flat; Query.count() would wrap the full
+    # entity SELECT in a subquery first.
     remaining_notes = (
-        db.query(models.Note)
-        .outerjoin(
-            models.CRMFact,
-            and_(
-                models.CRMFact.source_type == "note",
-                models.CRMFact.source_id == models.Note.id,
-            ),
-        )
-        .filter(models.CRMFact.id.is_(None))
-        .count()
+        _missing_fact_query(db, models.Note, "note")
+        .with_entities(func.count(models.Note.id))
+        .scalar()
     )
     remaining_interactions = (
-        db.query(models.Interaction)
-        .outerjoin(
-            models.CRMFact,
-            and_(
-                models.CRMFact.source_type == "interaction",
-                models.CRMFact.source_id == models.Interaction.id,
-            ),
-        )
-        .filter(models.CRMFact.id.is_(None))
-        .count()
+        _missing_fact_query(db, models.Interaction, "interaction")
+        .with_entities(func.count(models.Interaction.id))
+        .scalar()
     )
 
     logger.info(
@@ -908,6 +1096,65 @@ def backfill_crm_facts(
     }
 
 
+@app.post("/admin/batch_note_summaries")
+def submit_note_summary_batch(
+    token: str = Query(..., description="Admin token guarding the batch routes"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """Queue summaries for notes that have none on the OpenAI Batch API (24h, half price)."""
+    _require_admin_token(token)
+    notes = (
+        db.query(models.Note)
+        .options(selectinload(models.Note.contact))
+        .filter(models.Note.processed_summary.is_(None))
+        .order_by(models.Note.meeting_date.desc())
+        .limit(limit)
+        .all()
+    )
+    if not notes:
+        return {"batch_id": None, "submitted": 0}
+    items = [(note, note.contact or _ensure_contact_exists(note.contact_id, db)) for note in notes]
+    try:
+        batch_id = llm.submit_note_summary_batch(items)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Batch submission unavailable: {exc}") from exc
+    logger.info("note_summary_batch_submitted", extra={"batch_id": batch_id, "notes": len(items)})
+    return {"batch_id": batch_id, "submitted": len(items)}
+
+
+@app.post("/admin/batch_note_summaries/{batch_id}/collect")
+def collect_note_summary_batch(
+    batch_id: str,
+    token: str = Query(..., description="Admin token guarding the batch routes"),
+    db: Session = Depends(get_db),
+):
+    """Store the summaries from a finished batch; safe to poll until it completes."""
+    _require_admin_token(token)
+    try:
+        status, summaries = llm.note_summary_batch_results(batch_id)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Batch lookup unavailable: {exc}") from exc
+    if summaries is None:
+        return {"status": status, "updated": 0}
+
+    updated = 0
+    if summaries:
+        notes = db.query(models.Note).filter(models.Note.id.in_(list(summaries))).all()
+        for note in notes:
+            # Notes summarised interactively since submission keep that summary.
+            if note.processed_summary is None:
+                note.processed_summary = summaries[note.id]
+                updated += 1
+        db.commit()
+    logger.info("note_summary_batch_collected", extra={"batch_id": batch_id, "updated": updated})
+    return {"status": status, "updated": updated}
+
+
 @app.get("/notes/{note_id}/edit")
 def edit_note_form(note_id: int, request: Request, db: Session = Depends(get_db)):
     note = _get_note_with_contact(note_id, db)
@@ -981,7 +1228,7 @@ def update_note(
         source_type="note",
         source_id=note.id,
         text=raw_notes,
-        source_date=note.meeting_date.strftime("%Y-%m-%d") if note.meeting_date else None,
+        source_date=note.meeting_date.isoformat()[:10] if note.meeting_date else None,
     )
 
     return RedirectResponse(
@@ -1014,6 +1261,14 @@ def list_next_actions(request: Request, db: Session = Depends(get_db)):
     interactions = (
         db.query(models.Interaction)
         .join(models.Contact)
+        # The template renders each row's contact; fill it from the join we
+        # already do instead of one lazy SELECT per contact.
+        .options(
+            contains_eager(models.Interaction.contact).load_only(
+                models.Contact.id, models.Contact.name, raiseload=True
+            ),
+            raiseload("*"),
+        )
         .filter(models.Interaction.next_action_due.isnot(None))
         .filter(models.Interaction.next_action_due <= today)
         .order_by(models.Interaction.next_action_due.asc())
@@ -1027,28 +1282,45 @@ def list_next_actions(request: Request, db: Session = Depends(get_db)):
 
 @app.get("/metrics/outcomes")
 def outcomes_metrics(request: Request, db: Session = Depends(get_db)):
-    rows = (
-        db.query(models.Interaction.outcome, func.count(models.Interaction.id))
-        .group_by(models.Interaction.outcome)
-        .order_by(models.Interaction.outcome.asc())
-        .all()
-    )
-    metrics = [
-        {"outcome": outcome or "unknown", "count": count}
-        for outcome, count in rows
-    ]
+    # Read the version before querying: a write that lands mid-query bumps it,
+    # so these possibly stale counts are never served under the new version.
+    version = _outcome_metrics_version
+    cached = _outcome_metrics_cache.get(version)
+    if cached is not None and cached[0] > time.monotonic():
+        metrics = cached[1]
+    else:
+        rows = (
+            db.query(models.Interaction.outcome, func.count(models.Interaction.id))
+            .group_by(models.Interaction.outcome)
+            .order_by(models.Interaction.outcome.asc())
+            .all()
+        )
+        metrics = [
+            {"outcome": outcome or "unknown", "count": count}
+            for outcome, count in rows
+        ]
+        _outcome_metrics_cache.clear()
+        _outcome_metrics_cache[version] = (time.monotonic() + OUTCOME_METRICS_TTL, metrics)
     return templates.TemplateResponse(
         "metrics_outcomes.html",
         {"request": request, "metrics": metrics},
     )
 
 
+@app.get("/metrics/llm_cache")
+def llm_cache_metrics():
+    return JSONResponse(llm.response_cache_stats())
+
+
+# Async so the homepage fetch and the model call wait on the event loop's pooled
+# clients instead of holding a threadpool worker for several seconds. The
+# contact lookup runs on a worker thread and releases its connection first.
 @app.post("/contacts/{contact_id}/draft_first_email")
-def draft_first_email(contact_id: int, db: Session = Depends(get_db)):
-    contact = _ensure_contact_exists(contact_id, db)
-    website_summary = _try_fetch_website_summary(contact)
+async def draft_first_email(contact_id: int, db: Session = Depends(get_db)):
+    contact = await _load_then_release(db, lambda: _ensure_contact_exists(contact_id, db))
+    website_summary = await _atry_fetch_website_summary(contact)
     try:
-        email_text = llm.draft_first_email(contact, website_summary)
+        email_text = await llm.adraft_first_email(contact, website_summary)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
     except Exception as exc:
@@ -1056,9 +1328,47 @@ def draft_first_email(contact_id: int, db: Session = Depends(get_db)):
     return {"email": email_text}
 
 
-@app.post("/contacts/{contact_id}/draft_followup")
-def draft_followup_email(contact_id: int, db: Session = Depends(get_db)):
+@app.post("/contacts/batch_draft")
+async def batch_draft_first_emails(
+    contact_ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(get_db),
+):
+    unique_ids = list(dict.fromkeys(contact_ids))
+    if not unique_ids:
+        return {"drafts": {}}
+    if len(unique_ids) > BATCH_DRAFT_LIMIT:
+        raise HTTPException(
+            status_code=422, detail=f"At most {BATCH_DRAFT_LIMIT} contacts can be drafted per batch."
+        )
+    contacts = await _load_then_release(
+        db, lambda: db.query(models.Contact).filter(models.Contact.id.in_(unique_ids)).all()
+    )
+    missing = sorted(set(unique_ids) - {contact.id for contact in contacts})
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Contacts not found: {missing}")
+    try:
+        drafts = await llm.adraft_first_emails(contacts)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Email drafting service unavailable: {exc}") from exc
+    return {"drafts": {contact.id: draft for contact, draft in zip(contacts, drafts)}}
+
+
+# The request-scoped session would stay checked out until the last chunk is
+# sent, so the contact is loaded and the connection handed back before the
+# homepage fetch and the stream start.
+@app.post("/contacts/{contact_id}/draft_first_email/stream")
+def stream_first_email(contact_id: int, db: Session = Depends(get_db)):
     contact = _ensure_contact_exists(contact_id, db)
+    db.close()
+    website_summary = _try_fetch_website_summary(contact)
+    return _stream_draft(llm.draft_first_email_stream(contact, website_summary))
+
+
+def _load_followup_history(
+    contact: models.Contact, db: Session
+) -> Tuple[List[models.Interaction], List[models.Note]]:
     interactions = (
         db.query(models.Interaction)
         .filter(models.Interaction.contact_id == contact.id)
@@ -1073,8 +1383,26 @@ def draft_followup_email(contact_id: int, db: Session = Depends(get_db)):
         .limit(3)
         .all()
     )
+    return interactions, notes
+
+
+def _load_contact_with_followup_history(
+    contact_id: int, db: Session
+) -> Tuple[models.Contact, List[models.Interaction], List[models.Note]]:
+    contact = _ensure_contact_exists(contact_id, db)
+    interactions, notes = _load_followup_history(contact, db)
+    return contact, interactions, notes
+
+
+# Async for the same reason as draft_first_email; the contact and history load
+# on a worker thread and release their connection before the model call.
+@app.post("/contacts/{contact_id}/draft_followup")
+async def draft_followup_email(contact_id: int, db: Session = Depends(get_db)):
+    contact, interactions, notes = await _load_then_release(
+        db, lambda: _load_contact_with_followup_history(contact_id, db)
+    )
     try:
-        email_text = llm.draft_followup_email(contact, interactions, notes)
+        email_text = await llm.adraft_followup_email(contact, interactions, notes)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
     except Exception as exc:
@@ -1082,24 +1410,77 @@ def draft_followup_email(contact_id: int, db: Session = Depends(get_db)):
     return {"email": email_text}
 
 
-@app.get("/contacts/{contact_id}/draft_custom_email")
-def custom_email_form(contact_id: int, request: Request, db: Session = Depends(get_db)):
-    contact = _ensure_contact_exists(contact_id, db)
-    website_summary = _try_fetch_website_summary(contact)
-    greeting = _build_greeting(contact)
-    form_defaults = DEFAULT_CUSTOM_EMAIL_FORM.copy()
+# Hands the connection back before streaming, like stream_first_email.
+@app.post("/contacts/{contact_id}/draft_followup/stream")
+def stream_followup_email(contact_id: int, db: Session = Depends(get_db)):
+    contact, interactions, notes = _load_contact_with_followup_history(contact_id, db)
+    db.close()
+    return _stream_draft(llm.draft_followup_email_stream(contact, interactions, notes))
+
+
+def _load_custom_email_history(
+    contact: models.Contact, db: Session
+) -> Tuple[List[models.Interaction], List[models.Note]]:
+    """Most recent interactions and notes offered as optional context on the custom email page."""
     interactions = (
         db.query(models.Interaction)
         .filter(models.Interaction.contact_id == contact.id)
         .order_by(models.Interaction.timestamp.desc())
+        .limit(CUSTOM_EMAIL_HISTORY_LIMIT)
         .all()
     )
     notes = (
         db.query(models.Note)
         .filter(models.Note.contact_id == contact.id)
         .order_by(models.Note.meeting_date.desc())
+        .limit(CUSTOM_EMAIL_HISTORY_LIMIT)
         .all()
     )
+    return interactions, notes
+
+
+def _load_custom_email_page(
+    contact_id: int,
+    db: Session,
+    interaction_ids: Sequence[int] = (),
+    note_ids: Sequence[int] = (),
+) -> Tuple[
+    models.Contact,
+    List[models.Interaction],
+    List[models.Note],
+    List[models.Interaction],
+    List[models.Note],
+]:
+    """Contact, offered history and the selected history for the custom email page."""
+    contact = _ensure_contact_exists(contact_id, db)
+    interactions, notes = _load_custom_email_history(contact, db)
+    selected_interactions = (
+        db.query(models.Interaction)
+        .filter(models.Interaction.contact_id == contact.id, models.Interaction.id.in_(interaction_ids))
+        .order_by(models.Interaction.timestamp.desc())
+        .all()
+        if interaction_ids
+        else []
+    )
+    selected_notes = (
+        db.query(models.Note)
+        .filter(models.Note.contact_id == contact.id, models.Note.id.in_(note_ids))
+        .order_by(models.Note.meeting_date.desc())
+        .all()
+        if note_ids
+        else []
+    )
+    return contact, interactions, notes, selected_interactions, selected_notes
+
+
+@app.get("/contacts/{contact_id}/draft_custom_email")
+async def custom_email_form(contact_id: int, request: Request, db: Session = Depends(get_db)):
+    contact, interactions, notes, _, _ = await _load_then_release(
+        db, lambda: _load_custom_email_page(contact_id, db)
+    )
+    website_summary = await _atry_fetch_website_summary(contact)
+    greeting = llm.build_greeting(contact)
+    form_defaults = DEFAULT_CUSTOM_EMAIL_FORM.copy()
     return templates.TemplateResponse(
         "contact_custom_email.html",
         {
@@ -1123,7 +1504,7 @@ def custom_email_form(contact_id: int, request: Request, db: Session = Depends(g
 
 
 @app.post("/contacts/{contact_id}/draft_custom_email")
-def generate_custom_email(
+async def generate_custom_email(
     contact_id: int,
     request: Request,
     purpose: str = Form(...),
@@ -1134,37 +1515,20 @@ def generate_custom_email(
     note_ids: List[int] = Form([]),
     db: Session = Depends(get_db),
 ):
-    contact = _ensure_contact_exists(contact_id, db)
-    greeting = _build_greeting(contact)
-    website_summary = _try_fetch_website_summary(contact)
-    interactions = (
-        db.query(models.Interaction)
-        .filter(models.Interaction.contact_id == contact.id)
-        .order_by(models.Interaction.timestamp.desc())
-        .all()
-    )
-    notes = (
-        db.query(models.Note)
-        .filter(models.Note.contact_id == contact.id)
-        .order_by(models.Note.meeting_date.desc())
-        .all()
+    contact, interactions, notes, selected_interactions, selected_notes = await _load_then_release(
+        db, lambda: _load_custom_email_page(contact_id, db, interaction_ids, note_ids)
     )
-
-    interaction_id_set = set(interaction_ids or [])
-    note_id_set = set(note_ids or [])
-    selected_interactions = [interaction for interaction in interactions if interaction.id in interaction_id_set]
-    selected_notes = [note for note in notes if note.id in note_id_set]
+    greeting = llm.build_greeting(contact)
+    website_summary = await _atry_fetch_website_summary(contact)
     selected_interaction_ids = [interaction.id for interaction in selected_interactions]
     selected_note_ids = [note.id for note in selected_notes]
     selected_interaction_preview = _format_selected_interaction_lines(selected_interactions)
     selected_note_preview = _format_selected_note_lines(selected_notes)
 
     errors = []
-    valid_purposes = {value for value, _ in CUSTOM_EMAIL_PURPOSES}
-    valid_tones = {value for value, _ in CUSTOM_EMAIL_TONES}
-    if purpose not in valid_purposes:
+    if purpose not in VALID_CUSTOM_EMAIL_PURPOSES:
         errors.append("Select a valid purpose.")
-    if tone not in valid_tones:
+    if tone not in VALID_CUSTOM_EMAIL_TONES:
         errors.append("Select a valid tone.")
     if not brief.strip():
         errors.append("Provide a brief so the model has direction.")
@@ -1200,7 +1564,7 @@ def generate_custom_email(
 
     email_text: Optional[str] = None
     try:
-        email_text = llm.draft_custom_email(
+        email_text = await llm.adraft_custom_email(
             contact=contact,
             greeting=greeting,
             purpose=purpose,
@@ -1228,8 +1592,7 @@ def generate_custom_email(
     )
 
 
-@app.post("/notes/{note_id}/summarise")
-def summarise_note(note_id: int, db: Session = Depends(get_db)):
+def _load_note_with_contact(note_id: int, db: Session) -> Tuple[models.Note, models.Contact]:
     note = (
         db.query(models.Note)
         .options(selectinload(models.Note.contact))
@@ -1239,16 +1602,32 @@ def summarise_note(note_id: int, db: Session = Depends(get_db)):
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     contact = note.contact or _ensure_contact_exists(note.contact_id, db)
+    return note, contact
+
+
+def _save_note_summary(note_id: int, summary_text: str, db: Session) -> models.Note:
+    note = db.get(models.Note, note_id)
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    note.processed_summary = summary_text
+    db.commit()
+    db.refresh(note)
+    return note
+
+
+# Async so the summariser call waits on the event loop instead of holding a
+# threadpool worker; the page shows a status line until the summary returns.
+# Both DB steps run on worker threads and the connection is released between them.
+@app.post("/notes/{note_id}/summarise")
+async def summarise_note(note_id: int, db: Session = Depends(get_db)):
+    note, contact = await _load_then_release(db, lambda: _load_note_with_contact(note_id, db))
 
     try:
-        summary_text = llm.summarise_note(note, contact)
+        summary_text = await llm.asummarise_note(note, contact)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"Note summarisation unavailable: {exc}") from exc
 
-    note.processed_summary = summary_text
-    db.commit()
-
-    db.refresh(note)
+    note = await _load_then_release(db, lambda: _save_note_summary(note_id, summary_text, db))
     return JSONResponse({"summary": note.processed_summary or ""})
@@ -11,6 +11,21 @@ from .database import Base
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        # Serve the list page's ILIKE '%q%' search; Postgres-only (pg_trgm).
+        Index(
+            "idx_contacts_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_contacts_company_name_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -54,6 +69,11 @@ class Contact(Base):
 
 class Interaction(Base):
     __tablename__ = "interactions"
+    __table_args__ = (
+        # /next-actions range-scans due dates in order; contact_id rides along
+        # for the join to contacts.
+        Index("idx_interactions_due_contact", "next_action_due", "contact_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     contact_id: Mapped[int] = mapped_column(
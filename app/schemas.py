@@ -90,7 +90,7 @@ class CRMFactPayload(BaseModel):
     next_action_hint: Optional[str] = None
     summary: str = "(unclear)"
     raw_text: Optional[str] = None
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", cache_strings="all")
 
 
 class NextActionSuggestion(BaseModel):
@@ -109,4 +109,4 @@ class NextActionSuggestion(BaseModel):
     suggested_due_date: Optional[date] = None
     confidence: float = Field(default=0.0, ge=0.0, le=1.0)
     notes_for_adam: Optional[str] = None
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", cache_strings="all")
@@ -0,0 +1,169 @@
+"""Embedding-similarity cache for near-duplicate prompts used by `app.llm`."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """Return a stored reply when a new prompt embeds close to an earlier one.
+
+    Each namespace (model + system prompt + scope such as a URL) keeps an
+    `(N, dim)` matrix of L2-normalised embeddings and the replies in the same
+    order. A miss appends one line to `<namespace>.jsonl` instead of rewriting
+    the store, and every lookup first reads whatever other workers appended
+    since it last looked, so workers share hits while running and across
+    restarts. Once the log holds twice `max_entries` lines it is compacted to
+    the newest `max_entries`.
+    """
+
+    def __init__(self, directory: Path, *, threshold: float = 0.92, max_entries: int = 5000) -> None:
+        self.directory = directory
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, namespace: str, embedding: Sequence[float]) -> Optional[str]:
+        query = _normalise(embedding)
+        with self._lock:
+            entry = self._refresh(namespace)
+            if not entry.replies or entry.matrix.shape[1] != query.shape[0]:
+                return None
+            similarities = entry.matrix @ query
+            best = int(similarities.argmax())
+            if similarities[best] < self.threshold:
+                return None
+            return entry.replies[best]
+
+    def add(self, namespace: str, embedding: Sequence[float], reply: str) -> None:
+        row = _normalise(embedding)
+        line = json.dumps({"embedding": _encode(row), "reply": reply}).encode("utf-8") + b"\n"
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                # Unbuffered append: the whole line goes out in one write, so
+                # lines from concurrent workers do not interleave.
+                with open(self._path(namespace), "ab", buffering=0) as handle:
+                    handle.write(line)
+            except OSError:
+                # Same contract as FileCache: caching must never break drafting,
+                # so the reply is kept in this worker's memory only.
+                self._extend(self._refresh(namespace), [row], [reply])
+                return
+            entry = self._refresh(namespace)
+            if entry.lines >= 2 * self.max_entries:
+                self._compact(namespace, entry)
+
+    def _path(self, namespace: str) -> Path:
+        return self.directory / f"{namespace}.jsonl"
+
+    def _refresh(self, namespace: str) -> "_Namespace":
+        """Fold in lines appended since this worker last read the namespace log."""
+        entry = self._namespaces.setdefault(namespace, _Namespace())
+        path = self._path(namespace)
+        try:
+            stat = path.stat()
+            if stat.st_ino != entry.inode:
+                # First read, or another worker compacted the log: start over.
+                entry = self._namespaces[namespace] = _Namespace(inode=stat.st_ino)
+            if stat.st_size <= entry.offset:
+                return entry
+            with open(path, "rb") as handle:
+                handle.seek(entry.offset)
+                chunk = handle.read(stat.st_size - entry.offset)
+        except OSError:
+            return entry
+        complete = chunk[: chunk.rfind(b"\n") + 1]  # skip a line still being written
+        rows: List[np.ndarray] = []
+        replies: List[str] = []
+        for raw in complete.splitlines():
+            try:
+                item = json.loads(raw)
+                rows.append(_decode(item["embedding"]))
+                replies.append(str(item["reply"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+        entry.offset += len(complete)
+        entry.lines += complete.count(b"\n")
+        self._extend(entry, rows, replies)
+        return entry
+
+    def _extend(self, entry: "_Namespace", rows: List[np.ndarray], replies: List[str]) -> None:
+        if not rows:
+            return
+        dim = rows[-1].shape[0]
+        # If the embedding model changed, only rows in the newest shape are kept.
+        if entry.matrix.shape[1] != dim:
+            entry.matrix, entry.replies = np.empty((0, dim), dtype=np.float32), []
+        kept = [(row, reply) for row, reply in zip(rows, replies) if row.shape[0] == dim]
+        stacked = np.vstack([entry.matrix, np.stack([row for row, _ in kept])])
+        entry.matrix = stacked[-self.max_entries :]
+        entry.replies = (entry.replies + [reply for _, reply in kept])[-self.max_entries :]
+
+    def _compact(self, namespace: str, entry: "_Namespace") -> None:
+        # A reply another worker appends between our read and the replace is
+        # dropped; that only costs a future model call.
+        data = b"".join(
+            json.dumps({"embedding": _encode(row), "reply": reply}).encode("utf-8") + b"\n"
+            for row, reply in zip(entry.matrix, entry.replies)
+        )
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".jsonl")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, self._path(namespace))
+            entry.inode = self._path(namespace).stat().st_ino
+        except OSError:
+            return
+        entry.offset = len(data)
+        entry.lines = len(entry.replies)
+
+
+class _Namespace:
+    """In-memory view of one namespace log and how far into it has been read."""
+
+    __slots__ = ("matrix", "replies", "offset", "lines", "inode")
+
+    def __init__(self, inode: int = -1) -> None:
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.replies: List[str] = []
+        self.offset = 0
+        self.lines = 0
+        self.inode = inode
+
+
+def _encode(row: np.ndarray) -> str:
+    return base64.b64encode(row.astype(np.float32).tobytes()).decode("ascii")
+
+
+def _decode(value: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype=np.float32)
+
+
+def _normalise(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def default_cache_dir() -> Path:
+    configured = os.getenv("ATLAS_SEMANTIC_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(tempfile.gettempdir()) / "atlas-semantic-cache"
+
+
+def default_threshold() -> float:
+    try:
+        return float(os.getenv("ATLAS_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    except ValueError:
+        return 0.92
@@ -0,0 +1,38 @@
+"""Trigram indexes for contact search"""
+
+from alembic import op
+
+
+revision = "20261015_0002"
+down_revision = "20241113_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # `/contacts?q=` filters with ILIKE '%q%', which a btree index cannot serve;
+    # pg_trgm GIN indexes can. Other databases keep scanning.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "idx_contacts_name_trgm",
+        "contacts",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "idx_contacts_company_name_trgm",
+        "contacts",
+        ["company_name"],
+        postgresql_using="gin",
+        postgresql_ops={"company_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("idx_contacts_company_name_trgm", table_name="contacts")
+    op.drop_index("idx_contacts_name_trgm", table_name="contacts")
@@ -0,0 +1,21 @@
+"""Index interactions by next action due date"""
+
+from alembic import op
+
+
+revision = "20261015_0003"
+down_revision = "20261015_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_interactions_due_contact",
+        "interactions",
+        ["next_action_due", "contact_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_interactions_due_contact", table_name="interactions")
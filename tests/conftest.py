@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app import main
 from app.database import Base, get_db
 from app.main import app
 
@@ -20,6 +23,17 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    # The contacts list and outcome metrics caches are process-global; drop
+    # them so one test's cached response never answers another test's request.
+    main._contacts_list_cache.clear()
+    main._outcome_metrics_cache.clear()
+    yield
+    main._contacts_list_cache.clear()
+    main._outcome_metrics_cache.clear()
+
+
 @pytest.fixture
 def db_session() -> Session:
     Base.metadata.create_all(bind=engine)
@@ -31,6 +45,26 @@ def db_session() -> Session:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def capture_sql(db_session: Session):
+    """Context manager that yields the list of SQL statements run while it is open."""
+
+    @contextmanager
+    def capture():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return capture
+
+
 @pytest.fixture
 def client(db_session: Session):
     def override_get_db():
@@ -1,4 +1,48 @@
+from anyio import to_thread
+from fastapi.testclient import TestClient
+
+from app import main
+from app.database import POOL_CAPACITY
+from app.main import app
+
+
 def test_root_redirects_to_contacts(client):
     response = client.get("/", follow_redirects=False)
     assert response.status_code == 303
     assert response.headers["location"] == "/contacts"
+
+
+def test_lifespan_sizes_the_sync_route_threadpool(monkeypatch):
+    monkeypatch.setenv("ATLAS_THREADPOOL_SIZE", "16")
+    with TestClient(app) as client:
+        tokens = client.portal.call(lambda: to_thread.current_default_thread_limiter().total_tokens)
+
+    assert tokens == 16
+
+
+def test_threadpool_defaults_to_the_connection_pool_capacity(monkeypatch):
+    monkeypatch.delenv("ATLAS_THREADPOOL_SIZE", raising=False)
+    assert main._threadpool_size() == POOL_CAPACITY == 30
+
+    monkeypatch.setenv("ATLAS_THREADPOOL_SIZE", "not-a-number")
+    assert main._threadpool_size() == POOL_CAPACITY
+
+
+def test_threadpool_overrides_are_clamped_to_the_connection_pool(monkeypatch, caplog):
+    monkeypatch.setenv("ATLAS_THREADPOOL_SIZE", "64")
+
+    with caplog.at_level("WARNING", logger="atlas.app"):
+        assert main._threadpool_size() == POOL_CAPACITY
+
+    assert [record.message for record in caplog.records] == ["threadpool_size_clamped"]
+
+
+def test_template_bytecode_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("ATLAS_TEMPLATE_CACHE_DIR", raising=False)
+    assert main._template_bytecode_cache() is None
+
+    monkeypatch.setenv("ATLAS_TEMPLATE_CACHE_DIR", str(tmp_path / "jinja"))
+    cache = main._template_bytecode_cache()
+    assert cache is not None
+    assert cache.directory == str(tmp_path / "jinja")
+    assert (tmp_path / "jinja").is_dir()
@@ -1,4 +1,9 @@
-from app import models
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app import main, models
 
 
 def _create_contact(db_session, **overrides):
@@ -115,3 +120,230 @@ def test_update_contact_duplicate_email_shows_error(client, db_session):
 
     assert response.status_code == 200
     assert "A contact with that email already exists." in response.text
+
+
+def test_stream_first_email_releases_the_session_before_streaming(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+    contact.website_url = "https://example.com"
+    db_session.commit()
+    in_transaction = []
+
+    def fake_website(url, company_name):
+        in_transaction.append(db_session.in_transaction())
+        return "Homepage summary"
+
+    def fake_stream(contact, website_summary):
+        in_transaction.append(db_session.in_transaction())
+        yield "Hi Initial,"
+        yield f" {website_summary}."
+
+    monkeypatch.setattr("app.llm.fetch_and_summarise_website", fake_website)
+    monkeypatch.setattr("app.llm.draft_first_email_stream", fake_stream)
+
+    response = client.post(f"/contacts/{contact.id}/draft_first_email/stream")
+
+    assert response.status_code == 200
+    assert response.text == "Hi Initial, Homepage summary."
+    assert in_transaction == [False, False]
+
+
+def test_stream_followup_email_releases_the_session_before_streaming(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+    db_session.add(
+        models.Interaction(contact_id=contact.id, type="call", summary="Scoping call", outcome="pending")
+    )
+    db_session.commit()
+    in_transaction = []
+
+    def fake_stream(contact, interactions, notes):
+        in_transaction.append(db_session.in_transaction())
+        yield "Thanks for the call,"
+        yield f" recap of {interactions[0].summary}."
+
+    monkeypatch.setattr("app.llm.draft_followup_email_stream", fake_stream)
+
+    response = client.post(f"/contacts/{contact.id}/draft_followup/stream")
+
+    assert response.status_code == 200
+    assert response.text == "Thanks for the call, recap of Scoping call."
+    assert in_transaction == [False]
+
+
+def test_contact_page_drafts_through_the_stream_routes(client, db_session):
+    contact = _create_contact(db_session)
+
+    response = client.get(f"/contacts/{contact.id}")
+
+    assert "streamDraft('draft_first_email')" in response.text
+    assert "streamDraft('draft_followup')" in response.text
+    assert f"/contacts/{contact.id}/${{endpoint}}/stream" in response.text
+    assert "response.body.getReader()" in response.text
+
+
+def test_draft_first_email_awaits_async_drafting(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+
+    async def fake_draft(contact, website_summary):
+        assert not db_session.in_transaction()
+        return f"Hi {contact.name.split()[0]}, summary={website_summary}"
+
+    monkeypatch.setattr("app.llm.adraft_first_email", fake_draft)
+
+    response = client.post(f"/contacts/{contact.id}/draft_first_email")
+
+    assert response.status_code == 200
+    assert response.json() == {"email": "Hi Initial, summary=None"}
+
+
+def test_draft_followup_awaits_async_drafting(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+
+    async def fake_draft(contact, interactions, notes):
+        assert not db_session.in_transaction()
+        return f"Follow-up for {contact.name} ({len(interactions)} touches)"
+
+    monkeypatch.setattr("app.llm.adraft_followup_email", fake_draft)
+
+    response = client.post(f"/contacts/{contact.id}/draft_followup")
+
+    assert response.status_code == 200
+    assert response.json() == {"email": "Follow-up for Initial Contact (0 touches)"}
+
+
+def test_batch_draft_returns_one_draft_per_contact(client, db_session, monkeypatch):
+    first = _create_contact(db_session, name="Ana One", email="ana@example.com")
+    second = _create_contact(db_session, name="Ben Two", email="ben@example.com")
+
+    async def fake_batch(contacts):
+        assert not db_session.in_transaction()
+        return [f"Draft for {contact.name}" for contact in contacts]
+
+    monkeypatch.setattr("app.llm.adraft_first_emails", fake_batch)
+
+    response = client.post("/contacts/batch_draft", json={"contact_ids": [second.id, first.id, second.id]})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "drafts": {str(first.id): "Draft for Ana One", str(second.id): "Draft for Ben Two"}
+    }
+
+    missing = client.post("/contacts/batch_draft", json={"contact_ids": [first.id, 9999]})
+    assert missing.status_code == 404
+
+
+def test_ensure_contact_exists_reuses_contacts_loaded_in_the_session(db_session, capture_sql):
+    contact = _create_contact(db_session)
+    with capture_sql() as statements:
+        assert main._ensure_contact_exists(contact.id, db_session) is contact
+
+    assert statements == []
+    with pytest.raises(HTTPException):
+        main._ensure_contact_exists(9999, db_session)
+
+
+def test_list_contacts_loads_only_the_listed_columns(client, db_session):
+    _create_contact(db_session, name="Listed Person", company_name="Listed Co")
+    db_session.expunge_all()
+
+    response = client.get("/contacts", params={"q": "listed"})
+
+    assert response.status_code == 200
+    assert "Listed Person" in response.text
+    (contact,) = db_session.identity_map.values()
+    assert "email" not in contact.__dict__
+
+
+def test_contacts_list_is_cached_until_a_contact_changes(client, db_session, capture_sql):
+    contact = _create_contact(db_session, name="Cached Person")
+    client.get("/contacts")
+
+    with capture_sql() as statements:
+        cached = client.get("/contacts")
+        assert statements == []
+
+        client.post(
+            f"/contacts/{contact.id}/edit",
+            data={
+                "name": "Renamed Person",
+                "company_name": "Init Co",
+                "role": "CTO",
+                "email": contact.email,
+                "source": "referral",
+                "status": "client",
+            },
+            follow_redirects=False,
+        )
+        response = client.get("/contacts")
+
+    assert cached.status_code == 200
+    assert "Cached Person" in cached.text
+    assert "Renamed Person" in response.text
+
+
+def test_contact_detail_shows_latest_history_until_expanded(client, db_session, monkeypatch):
+    monkeypatch.setattr(main, "CONTACT_HISTORY_LIMIT", 2)
+    contact = _create_contact(db_session)
+    for index in range(3):
+        db_session.add(
+            models.Interaction(
+                contact_id=contact.id,
+                type="call",
+                summary=f"History call {index}",
+                timestamp=datetime(2024, 1, index + 1),
+            )
+        )
+    db_session.commit()
+
+    response = client.get(f"/contacts/{contact.id}")
+    assert "History call 2" in response.text
+    assert "History call 0" not in response.text
+    assert "Show full history" in response.text
+
+    response = client.get(f"/contacts/{contact.id}", params={"history": "all"})
+    assert "History call 0" in response.text
+    assert "Show full history" not in response.text
+
+
+def test_custom_email_form_renders_history_after_releasing_the_session(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+    contact.website_url = "https://example.com"
+    db_session.add(models.Interaction(contact_id=contact.id, type="call", summary="Offered call", outcome="pending"))
+    db_session.commit()
+
+    async def fake_website(url, company_name):
+        assert not db_session.in_transaction()
+        return "Homepage summary"
+
+    monkeypatch.setattr("app.llm.afetch_and_summarise_website", fake_website)
+
+    response = client.get(f"/contacts/{contact.id}/draft_custom_email")
+
+    assert response.status_code == 200
+    assert "Offered call" in response.text
+    assert "Homepage summary" in response.text
+
+
+def test_custom_email_sends_only_the_selected_history(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+    kept = models.Interaction(contact_id=contact.id, type="call", summary="Kept call", outcome="pending")
+    skipped = models.Interaction(contact_id=contact.id, type="email", summary="Skipped", outcome="pending")
+    db_session.add_all([kept, skipped])
+    db_session.commit()
+    captured = {}
+
+    async def fake_draft(**kwargs):
+        assert not db_session.in_transaction()
+        captured["interactions"] = [item.summary for item in kwargs["selected_interactions"]]
+        captured["notes"] = kwargs["selected_notes"]
+        return "Custom draft"
+
+    monkeypatch.setattr("app.llm.adraft_custom_email", fake_draft)
+
+    response = client.post(
+        f"/contacts/{contact.id}/draft_custom_email",
+        data={"purpose": "intro", "tone": "warm", "brief": "Say hello", "interaction_ids": [kept.id]},
+    )
+
+    assert response.status_code == 200
+    assert "Custom draft" in response.text
+    assert captured == {"interactions": ["Kept call"], "notes": []}
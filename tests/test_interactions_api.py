@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 
-from app import models
+from app import main, models
 
 
 def _create_contact(db_session):
@@ -40,6 +40,16 @@ def test_create_interaction_success(client, db_session):
     assert stored.summary == "Initial outreach"
 
 
+def test_new_interaction_form_defaults_due_date_a_week_out(client, db_session):
+    contact = _create_contact(db_session)
+
+    response = client.get(f"/contacts/{contact.id}/interactions/new")
+
+    assert response.status_code == 200
+    assert main._default_due_for(date.today()) in response.text
+    assert main._default_due_for(date(2026, 12, 28)) == "2027-01-04"
+
+
 def test_create_interaction_invalid_date(client, db_session):
     contact = _create_contact(db_session)
 
@@ -83,3 +93,69 @@ def test_update_interaction_success(client, db_session):
     updated = db_session.query(models.Interaction).filter(models.Interaction.id == interaction.id).one()
     assert updated.summary == "Updated summary"
     assert updated.outcome == "positive_meeting"
+
+
+def test_edit_interaction_form_loads_interaction_and_contact_together(client, db_session, capture_sql):
+    contact = _create_contact(db_session)
+    interaction = models.Interaction(contact_id=contact.id, type="email", summary="Pilot recap", outcome="pending")
+    db_session.add(interaction)
+    db_session.commit()
+    interaction_id = interaction.id
+    db_session.expunge_all()
+
+    with capture_sql() as statements:
+        response = client.get(f"/interactions/{interaction_id}/edit")
+
+    assert response.status_code == 200
+    assert "Sam Contact" in response.text
+    assert "Pilot recap" in response.text
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_next_actions_page_loads_contacts_with_the_interactions(client, db_session, capture_sql):
+    for index in range(3):
+        contact = models.Contact(
+            name=f"Due Contact {index}",
+            company_name="Atlas Labs",
+            role="COO",
+            email=f"due{index}@example.com",
+            source="referral",
+            status="prospect",
+        )
+        db_session.add(contact)
+        db_session.flush()
+        db_session.add(
+            models.Interaction(
+                contact_id=contact.id,
+                type="email",
+                summary="Chase reply",
+                next_action="Follow up",
+                next_action_due=date.today(),
+                outcome="pending",
+            )
+        )
+    db_session.commit()
+    db_session.expunge_all()
+
+    with capture_sql() as statements:
+        response = client.get("/next-actions")
+
+    assert response.status_code == 200
+    for index in range(3):
+        assert f"Due Contact {index}" in response.text
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_outcome_metrics_are_cached_until_an_interaction_changes(client, db_session, capture_sql):
+    contact = _create_contact(db_session)
+    form = {"interaction_type": "email", "summary": "Intro", "outcome": "no_reply", "outcome_notes": ""}
+
+    client.get("/metrics/outcomes")
+    with capture_sql() as statements:
+        assert client.get("/metrics/outcomes").status_code == 200
+        assert statements == []
+
+        client.post(f"/contacts/{contact.id}/interactions", data=form, follow_redirects=False)
+        response = client.get("/metrics/outcomes")
+
+    assert "No Reply" in response.text
@@ -0,0 +1,416 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import llm, models
+
+
+def test_get_client_reuses_pooled_instance(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+
+    first = llm._get_client()
+    second = llm._get_client()
+
+    assert first is second
+
+
+def test_get_client_requires_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    with pytest.raises(RuntimeError, match="OPENAI_API_KEY"):
+        llm._get_client()
+
+
+def test_validate_fact_json_accepts_clean_payload():
+    payload = llm._validate_fact_json(
+        '{"intent": "wants_training", "timeline": "this_month", "summary": "Asked for a workshop."}'
+    )
+
+    assert payload is not None
+    assert payload.intent == "wants_training"
+    assert payload.mentioned_process == "other/unclear"
+
+
+def test_validate_fact_json_defers_wrapped_or_invalid_payloads():
+    assert llm._validate_fact_json('```json\n{"summary": "x"}\n```') is None
+    assert llm._validate_fact_json('{"intent": "buy_now", "summary": "x"}') is None
+    assert llm._validate_fact_json('{"org": "", "summary": "x"}') is None
+
+
+def test_adraft_first_emails_drafts_each_contact(monkeypatch):
+    contacts = [
+        models.Contact(name="Ada Lovelace", role="CTO", company_name="Engines", source="referral"),
+        models.Contact(name="Grace Hopper", role="COO", company_name="Compilers", source="event"),
+    ]
+
+    async def fake_invoke(prompt, *, model=None, system_message=None):
+        return "draft for " + ("Ada" if "Hi Ada," in prompt else "Grace")
+
+    monkeypatch.setattr(llm, "_ainvoke_model", fake_invoke)
+
+    drafts = asyncio.run(llm.adraft_first_emails(contacts))
+
+    assert drafts == ["draft for Ada", "draft for Grace"]
+
+
+def test_adraft_bundle_overlaps_website_and_note_summaries(monkeypatch):
+    contact = models.Contact(
+        id=1, name="Ada Lovelace", role="CTO", company_name="Engines", website_url="https://engines.example"
+    )
+    note = models.Note(raw_notes="Discussed document review backlog.")
+    in_flight = []
+
+    async def fake_website(url, company_name):
+        in_flight.append("website")
+        await asyncio.sleep(0.01)
+        assert "note" in in_flight
+        return "Builds engines."
+
+    async def fake_note(note, contact):
+        in_flight.append("note")
+        await asyncio.sleep(0.01)
+        return "Note summary."
+
+    async def fake_draft(contact, website_summary):
+        return f"Draft using {website_summary}"
+
+    monkeypatch.setattr(llm, "afetch_and_summarise_website", fake_website)
+    monkeypatch.setattr(llm, "asummarise_note", fake_note)
+    monkeypatch.setattr(llm, "adraft_first_email", fake_draft)
+
+    bundle = asyncio.run(llm.adraft_bundle(contact, note))
+
+    assert bundle == ("Builds engines.", "Note summary.", "Draft using Builds engines.")
+
+
+def test_draft_first_emails_sends_prompts_concurrently_in_order(monkeypatch):
+    contacts = [
+        models.Contact(name="Ada Lovelace", role="CTO", company_name="Engines", source="referral"),
+        models.Contact(name="Grace Hopper", role="COO", company_name="Compilers", source="event"),
+    ]
+
+    async def fake_request(prompt, target_model, system_prompt):
+        # The first prompt finishes last; output order must still follow input order.
+        await asyncio.sleep(0.02 if "Hi Ada," in prompt else 0)
+        return "Ada draft" if "Hi Ada," in prompt else "Grace draft"
+
+    monkeypatch.setattr(llm, "_arequest_completion", fake_request)
+
+    drafts = llm.draft_first_emails(contacts, ["Builds engines.", None])
+
+    assert drafts == ["Ada draft", "Grace draft"]
+
+
+def test_coalesce_deltas_batches_small_chunks():
+    chunks = list(llm._coalesce_deltas(["Hi", " ", "there", ",", " Sam"], min_chars=6))
+
+    assert chunks == ["Hi there", ", Sam"]
+
+
+def test_chat_stream_deltas_skip_empty_chunks():
+    events = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hello"))]),
+        SimpleNamespace(choices=[]),
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))]),
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=" there"))]),
+    ]
+
+    assert list(llm._chat_stream_deltas(events)) == ["Hello", " there"]
+
+
+def test_extract_crm_facts_bulk_splits_one_reply_per_source(monkeypatch):
+    monkeypatch.setattr(llm, "fact_extraction_enabled", lambda: True)
+    prompts = []
+
+    def fake_invoke(prompt, *, model=None, system_message=None):
+        prompts.append(prompt)
+        return (
+            '[{"id": 1, "intent": "wants_training", "summary": "Wants a workshop."},'
+            ' {"id": 0, "intent": "not-a-real-intent", "summary": "Asked about audits."}]'
+        )
+
+    monkeypatch.setattr(llm, "_invoke_model", fake_invoke)
+    items = [
+        {"text": "Asked about audits", "contact_name": "Sam", "contact_company": None,
+         "contact_email": None, "source_type": "note", "source_id": 1},
+        {"text": "Wants a workshop", "contact_name": "Sam", "contact_company": None,
+         "contact_email": None, "source_type": "interaction", "source_id": 2},
+    ]
+
+    facts = llm.extract_crm_facts_bulk(items)
+
+    assert len(prompts) == 1
+    assert [fact["summary"] for fact in facts] == ["Asked about audits.", "Wants a workshop."]
+    assert facts[0]["intent"] == "unclear"
+    assert facts[1]["intent"] == "wants_training"
+
+
+def test_extract_homepage_text_drops_scripts_and_collapses_whitespace(monkeypatch):
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: None)
+    html = (
+        "<html><head><style>p { color: red; }</style></head><body>"
+        "<p>Precision   <b>engineering</b></p><script>track()</script>"
+        "<noscript>enable js</noscript>\n<div>since 1987</div></body></html>"
+    )
+
+    assert llm._extract_homepage_text(html) == "Precision engineering since 1987"
+
+
+def test_best_effort_json_loads_handles_bare_fenced_and_prose_replies():
+    assert llm._best_effort_json_loads(' {"a": 1} ') == {"a": 1}
+    assert llm._best_effort_json_loads('```json\n{"a": 2}\n```') == {"a": 2}
+    assert llm._best_effort_json_loads('Sure! {"a": 3} Hope that helps.') == {"a": 3}
+    assert llm._best_effort_json_loads("no json here") is None
+
+
+def test_website_session_is_shared_and_pooled():
+    llm._get_http_session.cache_clear()
+    session = llm._get_http_session()
+
+    assert llm._get_http_session() is session
+    assert session.headers["User-Agent"] == "AtlasBD/1.0"
+    assert session.get_adapter("https://example.com").max_retries.total == 2
+
+
+def test_bulk_helpers_preserve_order_and_isolate_website_failures(monkeypatch):
+    def fake_suggest(contact, interactions, notes, facts):
+        return {"contact": contact}
+
+    async def fake_fetch(url, company_name):
+        if "down" in url:
+            raise RuntimeError("Website content could not be fetched reliably.")
+        return f"summary of {company_name}"
+
+    monkeypatch.setattr(llm, "suggest_next_action_for_contact", fake_suggest)
+    monkeypatch.setattr(llm, "afetch_and_summarise_website", fake_fetch)
+
+    suggestions = llm.suggest_next_actions_bulk([(name, [], [], []) for name in "abc"])
+    summaries = llm.fetch_and_summarise_websites(
+        [("https://a.example", "A"), ("https://down.example", "B"), ("https://c.example", "C")]
+    )
+
+    assert [item["contact"] for item in suggestions] == ["a", "b", "c"]
+    assert summaries == ["summary of A", None, "summary of C"]
+
+
+def test_truncate_to_token_budget_uses_encoder_when_available(monkeypatch):
+    class _WordEncoder:
+        def encode(self, text):
+            return text.split(" ")
+
+        def decode(self, tokens):
+            return " ".join(tokens)
+
+    text = "one two three four five"
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: _WordEncoder())
+    assert llm._truncate_to_token_budget(text, 3) == "one two three"
+    assert llm._truncate_to_token_budget(text, 10) == text
+
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: None)
+    assert llm._truncate_to_token_budget("abcdefghijkl", 2) == "abcdefgh"
+
+
+class _StreamedResponse:
+    encoding = "utf-8"
+
+    def __init__(self, body: bytes, status_code: int = 200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        return None
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def test_homepage_fetch_is_reused_within_the_worker(monkeypatch):
+    calls = []
+
+    class _Session:
+        def get(self, url, timeout, stream, headers):
+            calls.append(url)
+            return _StreamedResponse(b"<p>Hello</p>")
+
+    monkeypatch.setattr(llm, "_get_http_session", lambda: _Session())
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: None)
+    monkeypatch.setattr(llm, "_HOMEPAGE_TEXT_CACHE", llm.llm_cache.MemoryCache(maxsize=4, ttl=60))
+
+    assert llm._fetch_clean_homepage("https://acme.example") == "Hello"
+    assert llm._fetch_clean_homepage("https://acme.example") == "Hello"
+    assert calls == ["https://acme.example"]
+
+
+def test_crm_fact_extraction_requests_strict_structured_output(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    captured = {}
+
+    def fake_request(prompt, target_model, system_prompt, *, json_schema=None):
+        captured["json_schema"] = json_schema
+        return (
+            '{"contact_name": "Jane", "contact_email": null, "org": "Acme", "intent": "wants_training",'
+            ' "mentioned_process": "onboarding", "timeline": "this_month", "next_action_hint": null,'
+            ' "summary": "Wants AI training for onboarding."}'
+        )
+
+    monkeypatch.setattr(llm, "_request_completion", fake_request)
+
+    payload = llm.extract_crm_facts_from_text(
+        "Jane wants AI training for onboarding this month.",
+        contact_name="Jane",
+        contact_company="Acme",
+        contact_email=None,
+        source_type="note",
+    )
+
+    schema = captured["json_schema"]["schema"]
+    assert schema["additionalProperties"] is False
+    assert set(schema["required"]) == set(schema["properties"])
+    assert "raw_text" not in schema["properties"]
+    assert payload["intent"] == "wants_training"
+    assert payload["raw_text"] is None
+
+
+def test_homepage_fetch_stops_reading_at_the_byte_cap(monkeypatch):
+    response = _StreamedResponse(b"<p>" + b"a" * 50 + b"</p><p>unreachable</p>")
+    session = type("Session", (), {"get": lambda self, *args, **kwargs: response})()
+    monkeypatch.setattr(llm, "_get_http_session", lambda: session)
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: None)
+    monkeypatch.setattr(llm, "_HOMEPAGE_TEXT_CACHE", llm.llm_cache.MemoryCache(maxsize=4, ttl=60))
+    monkeypatch.setattr(llm, "_MAX_HOMEPAGE_BYTES", 40)
+    monkeypatch.setattr(llm, "_HOMEPAGE_CHUNK_BYTES", 16)
+
+    assert llm._fetch_clean_homepage("https://big.example") == "a" * 37
+    assert response.closed
+
+
+def test_warm_openai_client_is_opt_in(monkeypatch):
+    calls = []
+    models_api = type("Models", (), {"list": lambda self: calls.append("list")})()
+    client = type("Client", (), {"models": models_api})()
+    monkeypatch.setattr(llm, "_get_client", lambda: client)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    monkeypatch.delenv("ATLAS_WARM_OPENAI", raising=False)
+    assert llm.warm_openai_client() is None
+
+    monkeypatch.setenv("ATLAS_WARM_OPENAI", "1")
+    llm.warm_openai_client().join(timeout=5)
+    assert calls == ["list"]
+
+
+def test_shorten_snippet_matches_full_collapse_for_long_and_sparse_text():
+    long_text = "word " * 500
+    assert llm.shorten_snippet(long_text, limit=20) == "word word word wo..."
+
+    sparse = "a" + " " * 100 + "b" + "\n" * 100 + "c"
+    assert llm.shorten_snippet(sparse, limit=10) == "a b c"
+
+
+def test_extract_text_helpers_handle_known_reply_shapes():
+    chat = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" draft "))])
+    assert llm._extract_chat_text(chat) == "draft"
+    assert llm._extract_chat_text(SimpleNamespace(choices=[{"message": {"content": "dict"}}])) == "dict"
+    assert llm._extract_chat_text(SimpleNamespace(choices=[SimpleNamespace(message=None)])) is None
+
+
+def test_homepage_revalidation_reuses_stored_excerpt_on_304(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATLAS_LLM_CACHE", "1")
+    monkeypatch.setattr(llm, "_get_homepage_record_cache", lambda: llm.llm_cache.FileCache(tmp_path))
+    monkeypatch.setattr(llm, "_get_token_encoder", lambda: None)
+    sent_headers = []
+    responses = iter(
+        [
+            _StreamedResponse(b"<p>Fresh copy</p>", headers={"ETag": '"v1"'}),
+            _StreamedResponse(b"", status_code=304),
+        ]
+    )
+
+    class _Session:
+        def get(self, url, timeout, stream, headers):
+            sent_headers.append(headers)
+            return next(responses)
+
+    monkeypatch.setattr(llm, "_get_http_session", lambda: _Session())
+
+    for _ in range(2):
+        # A fresh worker each time, so only the on-disk record can help.
+        monkeypatch.setattr(llm, "_HOMEPAGE_TEXT_CACHE", llm.llm_cache.MemoryCache(maxsize=4, ttl=60))
+        assert llm._fetch_clean_homepage("https://acme.example") == "Fresh copy"
+
+    assert sent_headers == [{}, {"If-None-Match": '"v1"'}]
+
+
+def test_website_summary_routes_by_excerpt_length(monkeypatch):
+    excerpts = iter(["Coming soon", "Short but real homepage copy. " * 10, "Detailed homepage copy. " * 60])
+    models_used = []
+    monkeypatch.setattr(llm, "_fetch_clean_homepage", lambda url: next(excerpts))
+    monkeypatch.setattr(llm, "_WEBSITE_SUMMARY_CACHE", llm.llm_cache.MemoryCache(maxsize=4))
+
+    def fake_invoke(prompt, *, model, **kwargs):
+        models_used.append(model)
+        return "ok"
+
+    monkeypatch.setattr(llm, "_invoke_model", fake_invoke)
+
+    assert llm.fetch_and_summarise_website("https://a.example", "A") == llm._THIN_HOMEPAGE_SUMMARY
+    assert llm.fetch_and_summarise_website("https://b.example", "B") == "ok"
+    assert llm.fetch_and_summarise_website("https://c.example", "C") == "ok"
+    assert models_used == [llm._SUMMARISER_MODEL, llm._DRAFTING_MODEL]
+
+
+def test_website_summary_is_reused_until_the_excerpt_changes(monkeypatch):
+    excerpts = iter(["Homepage copy. " * 60, "Homepage copy. " * 60, "New homepage copy. " * 60])
+    calls = []
+    monkeypatch.setattr(llm, "_fetch_clean_homepage", lambda url: next(excerpts))
+    monkeypatch.setattr(llm, "_WEBSITE_SUMMARY_CACHE", llm.llm_cache.MemoryCache(maxsize=4))
+
+    def fake_invoke(prompt, **kwargs):
+        calls.append(prompt)
+        return f"summary {len(calls)}"
+
+    monkeypatch.setattr(llm, "_invoke_model", fake_invoke)
+
+    assert llm.fetch_and_summarise_website("https://a.example", "A") == "summary 1"
+    assert llm.fetch_and_summarise_website("https://a.example", "A") == "summary 1"
+    assert llm.fetch_and_summarise_website("https://a.example", "A") == "summary 2"
+    assert len(calls) == 2
+
+
+def test_async_http_client_is_per_loop_and_closed_by_blocking_runs():
+    async def grab():
+        return llm._get_async_http(), llm._get_async_http()
+
+    first, same = llm._run_blocking(grab())
+    second, _ = llm._run_blocking(grab())
+
+    assert first is same
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_request_completion_sends_schemas_as_chat_response_format(monkeypatch):
+    calls = []
+
+    def create(**kwargs):
+        calls.append((kwargs["model"], kwargs.get("response_format")))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" chat "))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "_get_client", lambda: client)
+
+    assert llm._request_completion("prompt", "model-a", "system") == "chat"
+    schema = {"name": "facts", "schema": {"type": "object"}}
+    assert llm._request_completion("prompt", "model-b", "system", json_schema=schema) == "chat"
+    assert calls == [
+        ("model-a", None),
+        ("model-b", {"type": "json_schema", "json_schema": {"strict": True, **schema}}),
+    ]
@@ -0,0 +1,33 @@
+import json
+
+from app import llm_batch
+
+
+def test_build_batch_jsonl_writes_one_chat_request_per_call():
+    payload = llm_batch.build_batch_jsonl([("note-1", "prompt", "model-a", "system")])
+
+    rows = [json.loads(line) for line in payload.decode("utf-8").splitlines()]
+
+    assert rows == [
+        {
+            "custom_id": "note-1",
+            "method": "POST",
+            "url": llm_batch.BATCH_ENDPOINT,
+            "body": {
+                "model": "model-a",
+                "messages": [
+                    {"role": "system", "content": "system"},
+                    {"role": "user", "content": "prompt"},
+                ],
+            },
+        }
+    ]
+
+
+def test_parse_batch_output_skips_failed_rows():
+    body = {"choices": [{"message": {"content": " Done "}}]}
+    ok = {"custom_id": "note-1", "response": {"status_code": 200, "body": body}}
+    failed = {"custom_id": "note-2", "response": {"status_code": 500, "body": {}}}
+    text = "\n".join(json.dumps(row) for row in (ok, failed)) + "\nnot json\n"
+
+    assert llm_batch.parse_batch_output(text) == {"note-1": "Done"}
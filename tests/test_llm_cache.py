@@ -0,0 +1,73 @@
+from app import llm, llm_cache
+
+
+def test_file_cache_round_trip(tmp_path):
+    cache = llm_cache.FileCache(tmp_path)
+    key = llm_cache.make_key("model", "system", "prompt")
+
+    assert cache.get(key) is None
+    cache.set(key, "cached draft", ttl=60)
+
+    assert cache.get(key) == "cached draft"
+
+
+def test_file_cache_expires_entries(tmp_path):
+    cache = llm_cache.FileCache(tmp_path)
+    cache.set("abc123", "stale", ttl=-1)
+
+    assert cache.get("abc123") is None
+
+
+def test_invoke_model_serves_repeat_prompts_from_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATLAS_LLM_CACHE", "1")
+    monkeypatch.setattr(llm, "_get_response_cache", lambda: llm_cache.FileCache(tmp_path))
+    calls = []
+
+    def fake_request(prompt, target_model, system_prompt, **kwargs):
+        calls.append(prompt)
+        return "fresh draft"
+
+    monkeypatch.setattr(llm, "_request_completion", fake_request)
+
+    monkeypatch.setattr(llm, "_RESPONSE_CACHE_STATS", llm_cache.CacheStats())
+
+    assert llm._invoke_model("same prompt") == "fresh draft"
+    assert llm._invoke_model("same prompt") == "fresh draft"
+    assert calls == ["same prompt"]
+    assert llm.response_cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_memory_cache_evicts_least_recent_and_expires(monkeypatch):
+    cache = llm_cache.MemoryCache(maxsize=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    now = llm_cache.time.monotonic()
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now + 61)
+    assert cache.get("c") is None
+
+
+def test_tiered_cache_promotes_slow_hits(tmp_path):
+    fast = llm_cache.MemoryCache(maxsize=4)
+    slow = llm_cache.FileCache(tmp_path)
+    slow.set("key", "from disk")
+
+    cache = llm_cache.TieredCache(fast, slow)
+
+    assert cache.get("key") == "from disk"
+    assert fast.get("key") == "from disk"
+
+
+def test_invoke_model_can_bypass_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATLAS_LLM_CACHE", "1")
+    monkeypatch.setattr(llm, "_get_response_cache", lambda: llm_cache.FileCache(tmp_path))
+    replies = iter(["first", "second"])
+    monkeypatch.setattr(llm, "_request_completion", lambda *args, **kwargs: next(replies))
+
+    assert llm._invoke_model("prompt") == "first"
+    assert llm._invoke_model("prompt", use_cache=False) == "second"
@@ -66,3 +66,150 @@ def test_delete_note(client, db_session):
 
     assert response.status_code == 303
     assert db_session.query(models.Note).count() == 0
+
+
+def test_note_summary_batch_submits_unsummarised_notes_and_stores_results(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setenv("INTEL_ADMIN_TOKEN", "secret")
+    contact = _create_contact(db_session)
+    pending = models.Note(contact_id=contact.id, meeting_date=date(2024, 1, 15), raw_notes="New")
+    done = models.Note(
+        contact_id=contact.id, meeting_date=date(2024, 1, 10), raw_notes="Old", processed_summary="Kept"
+    )
+    db_session.add_all([pending, done])
+    db_session.commit()
+    submitted = []
+
+    def fake_submit(items):
+        submitted.extend(note.id for note, _ in items)
+        return "batch_123"
+
+    monkeypatch.setattr("app.main.llm.submit_note_summary_batch", fake_submit)
+    monkeypatch.setattr(
+        "app.main.llm.note_summary_batch_results",
+        lambda batch_id: ("completed", {pending.id: "Batched summary", done.id: "Overwrite"}),
+    )
+
+    response = client.post("/admin/batch_note_summaries", params={"token": "secret"})
+    assert response.json() == {"batch_id": "batch_123", "submitted": 1}
+    assert submitted == [pending.id]
+
+    response = client.post("/admin/batch_note_summaries/batch_123/collect", params={"token": "secret"})
+    assert response.json() == {"status": "completed", "updated": 1}
+    db_session.expire_all()
+    assert db_session.get(models.Note, pending.id).processed_summary == "Batched summary"
+    assert db_session.get(models.Note, done.id).processed_summary == "Kept"
+
+
+def test_summarise_note_awaits_async_summariser(client, db_session, monkeypatch):
+    contact = _create_contact(db_session)
+    note = models.Note(contact_id=contact.id, meeting_date=date(2024, 1, 15), raw_notes="Pilot scope")
+    db_session.add(note)
+    db_session.commit()
+
+    async def fake_summarise(note, contact):
+        assert not db_session.in_transaction()
+        return f"Summary of {note.raw_notes}"
+
+    monkeypatch.setattr("app.main.llm.asummarise_note", fake_summarise)
+
+    note_id = note.id
+    response = client.post(f"/notes/{note_id}/summarise")
+
+    assert response.json() == {"summary": "Summary of Pilot scope"}
+    assert db_session.get(models.Note, note_id).processed_summary == "Summary of Pilot scope"
+
+
+def test_backfill_extracts_missing_facts_in_one_bulk_call(client, db_session, monkeypatch):
+    monkeypatch.setenv("INTEL_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr("app.main.llm.fact_extraction_enabled", lambda: True)
+    contact = _create_contact(db_session)
+    note = models.Note(contact_id=contact.id, meeting_date=date(2024, 1, 15), raw_notes="Pilot scope")
+    interaction = models.Interaction(contact_id=contact.id, type="call", summary="Intro call")
+    db_session.add_all([note, interaction])
+    db_session.commit()
+    calls = []
+
+    def fake_bulk(items):
+        calls.append([(item["source_type"], item["text"]) for item in items])
+        return [{"summary": item["text"]} for item in items]
+
+    monkeypatch.setattr("app.main.llm.extract_crm_facts_bulk", fake_bulk)
+
+    response = client.post("/admin/backfill_crm_facts", params={"token": "secret"})
+
+    assert response.json() == {
+        "processed_notes": 1,
+        "processed_interactions": 1,
+        "remaining_notes": 0,
+        "remaining_interactions": 0,
+    }
+    assert calls == [[("note", "Pilot scope"), ("interaction", "Intro call")]]
+    facts = db_session.query(models.CRMFact).order_by(models.CRMFact.source_type).all()
+    assert [(fact.source_type, fact.fact_payload) for fact in facts] == [
+        ("interaction", {"summary": "Intro call"}),
+        ("note", {"summary": "Pilot scope"}),
+    ]
+
+
+def test_backfill_skips_sources_that_already_have_facts(client, db_session, monkeypatch):
+    monkeypatch.setenv("INTEL_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr("app.main.llm.fact_extraction_enabled", lambda: True)
+    contact = _create_contact(db_session)
+    covered = models.Note(contact_id=contact.id, meeting_date=date(2024, 1, 10), raw_notes="Old")
+    missing = models.Note(contact_id=contact.id, meeting_date=date(2024, 1, 15), raw_notes="New")
+    db_session.add_all([covered, missing])
+    db_session.flush()
+    db_session.add(
+        models.CRMFact(
+            contact_id=contact.id, source_type="note", source_id=covered.id, fact_payload={}
+        )
+    )
+    db_session.commit()
+    monkeypatch.setattr(
+        "app.main.llm.extract_crm_facts_bulk",
+        lambda items: [{"summary": item["text"]} for item in items],
+    )
+
+    response = client.post("/admin/backfill_crm_facts", params={"token": "secret"})
+
+    assert response.json()["processed_notes"] == 1
+    sources = db_session.query(models.CRMFact.source_id).order_by(models.CRMFact.id).all()
+    assert [source_id for (source_id,) in sources] == [covered.id, missing.id]
+
+
+def test_backfill_loads_contacts_without_per_row_queries(client, db_session, monkeypatch, capture_sql):
+    monkeypatch.setenv("INTEL_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr("app.main.llm.fact_extraction_enabled", lambda: True)
+    monkeypatch.setattr(
+        "app.main.llm.extract_crm_facts_bulk",
+        lambda items: [{"summary": item["contact_name"]} for item in items],
+    )
+    for index in range(3):
+        contact = models.Contact(
+            name=f"Backfill {index}",
+            company_name="Atlas Labs",
+            role="Ops",
+            email=f"backfill{index}@example.com",
+            source="referral",
+            status="prospect",
+        )
+        contact.notes.append(models.Note(meeting_date=date(2024, 1, index + 1), raw_notes="Notes"))
+        contact.interactions.append(models.Interaction(type="call", summary="Call"))
+        db_session.add(contact)
+    db_session.commit()
+    db_session.expunge_all()
+
+    with capture_sql() as statements:
+        response = client.post("/admin/backfill_crm_facts", params={"token": "secret"})
+
+    body = response.json()
+    assert (body["processed_notes"], body["processed_interactions"]) == (3, 3)
+    assert (body["remaining_notes"], body["remaining_interactions"]) == (0, 0)
+    facts = db_session.query(models.CRMFact).all()
+    assert sorted(fact.fact_payload["summary"] for fact in facts) == sorted(
+        f"Backfill {index}" for index in range(3) for _ in ("note", "interaction")
+    )
+    # Two source pages, one contact load for each, and the two remaining counts.
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 6
@@ -0,0 +1,82 @@
+from datetime import date
+
+from app import llm, models, semantic_cache
+
+
+def test_semantic_cache_matches_near_duplicates_only(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path, threshold=0.9)
+    cache.add("ns", [1.0, 0.0, 0.0], "stored summary")
+
+    assert cache.lookup("ns", [0.99, 0.05, 0.0]) == "stored summary"
+    assert cache.lookup("ns", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("other", [1.0, 0.0, 0.0]) is None
+
+
+def test_semantic_cache_persists_between_instances(tmp_path):
+    semantic_cache.SemanticCache(tmp_path).add("ns", [0.0, 2.0], "persisted")
+
+    assert semantic_cache.SemanticCache(tmp_path).lookup("ns", [0.0, 1.0]) == "persisted"
+
+
+def test_semantic_cache_sees_replies_added_by_another_worker(tmp_path):
+    reader = semantic_cache.SemanticCache(tmp_path)
+    writer = semantic_cache.SemanticCache(tmp_path)
+    assert reader.lookup("ns", [1.0, 0.0]) is None
+
+    writer.add("ns", [1.0, 0.0], "from the other worker")
+
+    assert reader.lookup("ns", [1.0, 0.0]) == "from the other worker"
+
+
+def test_semantic_cache_appends_and_compacts_its_log(tmp_path):
+    cache = semantic_cache.SemanticCache(tmp_path, max_entries=2)
+    log = tmp_path / "ns.jsonl"
+
+    cache.add("ns", [1.0, 0.0], "first")
+    cache.add("ns", [0.0, 1.0], "second")
+    cache.add("ns", [1.0, 1.0], "third")
+    assert len(log.read_bytes().splitlines()) == 3
+
+    cache.add("ns", [1.0, -1.0], "fourth")
+    assert len(log.read_bytes().splitlines()) == 2
+    fresh = semantic_cache.SemanticCache(tmp_path, threshold=0.99)
+    assert fresh.lookup("ns", [1.0, 0.0]) is None
+    assert fresh.lookup("ns", [1.0, -1.0]) == "fourth"
+
+
+def test_invoke_model_reuses_semantically_close_reply(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATLAS_SEMANTIC_CACHE", "1")
+    cache = semantic_cache.SemanticCache(tmp_path, threshold=0.9)
+    monkeypatch.setattr(llm, "_get_semantic_cache", lambda: cache)
+    embeddings = {"Acme builds pumps.": [1.0, 0.0], "Acme builds pumps!": [0.98, 0.02]}
+    monkeypatch.setattr(llm, "_embed_text", lambda text: embeddings[text])
+    calls = []
+    monkeypatch.setattr(
+        llm, "_request_completion", lambda prompt, *args, **kwargs: calls.append(prompt) or "summary"
+    )
+
+    first = llm._invoke_model("prompt one", semantic_key=("website:acme", "Acme builds pumps."))
+    second = llm._invoke_model("prompt two", semantic_key=("website:acme", "Acme builds pumps!"))
+
+    assert first == second == "summary"
+    assert calls == ["prompt one"]
+
+
+def test_note_summaries_are_not_shared_across_meetings(monkeypatch, tmp_path):
+    monkeypatch.setenv("ATLAS_SEMANTIC_CACHE", "1")
+    cache = semantic_cache.SemanticCache(tmp_path, threshold=0.9)
+    monkeypatch.setattr(llm, "_get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(llm, "_embed_text", lambda text: [1.0, 0.0])
+    calls = []
+    monkeypatch.setattr(
+        llm, "_request_completion", lambda prompt, *args, **kwargs: calls.append(prompt) or "summary"
+    )
+    contact = models.Contact(id=1, name="Sam", company_name="Acme")
+    january = models.Note(id=1, contact_id=1, meeting_date=date(2024, 1, 5), raw_notes="Pilot scope")
+    february = models.Note(id=2, contact_id=1, meeting_date=date(2024, 2, 9), raw_notes="Pilot scope")
+
+    llm.summarise_note(january, contact)
+    llm.summarise_note(february, contact)
+
+    assert len(calls) == 2
+    assert "2024-02-09" in calls[1]